@@ -0,0 +1,30 @@
+"""add bbox columns and centroid index to changes
+
+Revision ID: 0003_changes_bbox
+Revises: 0002_change_summaries
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003_changes_bbox"
+down_revision = "0002_change_summaries"
+branch_labels = None
+depends_on = None
+
+_BBOX_COLUMNS = ("bbox_minx", "bbox_miny", "bbox_maxx", "bbox_maxy")
+
+
+def upgrade() -> None:
+    for name in _BBOX_COLUMNS:
+        op.add_column("changes", sa.Column(name, sa.Float(), nullable=True))
+    op.create_index("idx_changes_centroid", "changes", ["centroid_lat", "centroid_lon"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_changes_centroid", table_name="changes")
+    for name in reversed(_BBOX_COLUMNS):
+        op.drop_column("changes", name)
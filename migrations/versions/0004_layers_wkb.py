@@ -0,0 +1,24 @@
+"""add pre-dissolved WKB column to layers
+
+Revision ID: 0004_layers_wkb
+Revises: 0003_changes_bbox
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_layers_wkb"
+down_revision = "0003_changes_bbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("layers", sa.Column("wkb_blob", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("layers", "wkb_blob")
@@ -8,6 +8,11 @@ from urllib import request
 
 from src.core.config import settings
 
+try:  # optional streaming parser for large history indices
+    import ijson
+except Exception:  # pragma: no cover
+    ijson = None  # type: ignore[assignment]
+
 DEFAULT_BASE_URL = "https://deepstatemap.live"
 INDEX_RELATIVE_PATH = "history/index.json"
 
@@ -32,7 +37,8 @@ def save_index(entries: Iterable[HistoryEntry], data_root: Optional[str] = None)
     out_path = root / INDEX_RELATIVE_PATH
     _ensure_dir(out_path)
     serial = [{"id": e.id, "timestamp": e.timestamp, "date": e.date} for e in entries]
-    out_path.write_text(json.dumps(serial, ensure_ascii=False, indent=2), encoding="utf-8")
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(serial, f, ensure_ascii=False, indent=2)
     return out_path
 
 
@@ -41,13 +47,15 @@ def load_index(data_root: Optional[str] = None) -> list[HistoryEntry]:
     in_path = root / INDEX_RELATIVE_PATH
     if not in_path.exists():
         return []
-    data = json.loads(in_path.read_text(encoding="utf-8"))
     out: list[HistoryEntry] = []
-    for row in data:
-        try:
-            out.append(HistoryEntry(id=int(row["id"]), timestamp=int(row["timestamp"])) )
-        except Exception:
-            continue
+    with in_path.open("rb") as f:
+        # ijson yields one entry at a time instead of materializing the whole document
+        rows = ijson.items(f, "item") if ijson is not None else json.load(f)
+        for row in rows:
+            try:
+                out.append(HistoryEntry(id=int(row["id"]), timestamp=int(row["timestamp"])))
+            except Exception:
+                continue
     return out
 
 
@@ -4,6 +4,8 @@ from functools import lru_cache
 
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
 
 class Base(DeclarativeBase):
     pass
@@ -27,16 +29,40 @@ def make_sync_url() -> str:
     return f"mysql+pymysql://{user}:{password}@{host}:{port}/{db}?charset=utf8mb4"
 
 
+def _is_sqlite_memory(url: str) -> bool:
+    """True for private (`:memory:`) and named (`file:x?mode=memory&uri=true`) in-memory DBs."""
+    u = make_url(url)
+    if u.get_backend_name() != "sqlite":
+        return False
+    return u.database in (None, "", ":memory:") or u.query.get("mode") == "memory"
+
+
 @lru_cache(maxsize=4)
 def _cached_engine(url: str, echo: bool) -> object:
     # Note: return type is Engine, but keep it broad to avoid importing typing-only
+    if _is_sqlite_memory(url):
+        # One shared connection keeps the in-memory database alive and visible to every
+        # session and thread (the default pool would give each thread its own empty DB,
+        # and a shared-cache DB is dropped as soon as its last connection closes).
+        return create_engine(
+            url,
+            echo=echo,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
     return create_engine(url, echo=echo, pool_pre_ping=True, pool_recycle=3600)
 
 
-def get_engine(echo: bool | None = None):
+def get_engine(echo: bool | None = None, *, url: str | None = None):
+    """Return the process-wide engine for `url` (default: `make_sync_url()`).
+
+    Engines are cached per URL, so an engine requested with an explicit URL is the same
+    object the DAO gets once that URL is the configured one.
+    """
     if echo is None:
         echo = os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"
-    url = make_sync_url()
+    if url is None:
+        url = make_sync_url()
     return _cached_engine(url, echo)  # type: ignore[return-value]
 
 
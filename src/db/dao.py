@@ -10,11 +10,41 @@ import sqlalchemy as sa
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from src.domain.geo_changes import ChangeItem
+from src.domain.geo_changes import ChangeItem, dissolve_to_wkb
 
 from .base import get_session_maker
 from .models import Change, ChangeSummary, DateRef, Layer, Report
 
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+# Values per IN (...) probe; SQLite caps bind parameters per statement (999 before 3.32).
+_IN_BATCH_SIZE = 500
+
+
+def _dumps(obj) -> str:
+    """Serialize JSON payload columns (orjson when available, UTF-8 text either way)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _loads(text: str | bytes):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _item_from_json(d: dict) -> ChangeItem:
+    """Rebuild a ChangeItem from its stored `_asdict()` form (JSON turns tuples into lists)."""
+    fields = {k: v for k, v in d.items() if k in ChangeItem._fields}
+    fields["centroid"] = tuple(fields["centroid"])
+    if fields.get("bbox") is not None:
+        fields["bbox"] = tuple(fields["bbox"])
+    return ChangeItem(**fields)
+
 
 def _get_date_id(sess: Session, d: date) -> int | None:
     row = sess.execute(select(DateRef.id).where(DateRef.date == d)).scalar_one_or_none()
@@ -48,6 +78,38 @@ def get_layer_geojson_text(*, clazz: str, d: date) -> str | None:
             return None
 
 
+def get_layer_geom_source(*, clazz: str, d: date) -> bytes | str | None:
+    """Return the layer's pre-dissolved WKB if stored, else its GeoJSON text.
+
+    Either form is accepted by `compute_changes`.
+    """
+    SessionLocal = get_session_maker()
+    with SessionLocal() as sess:
+        did = _get_date_id(sess, d)
+        if did is None:
+            return None
+        row = sess.execute(
+            select(Layer.wkb_blob, Layer.geojson).where(Layer.date_id == did, Layer.clazz == clazz)
+        ).one_or_none()
+        if row is None:
+            return None
+        wkb_blob, gz = row
+        if wkb_blob:
+            return bytes(wkb_blob)
+        try:
+            return gzip.decompress(gz).decode("utf-8")
+        except Exception:
+            return None
+
+
+def _layer_wkb(geojson_text: str) -> bytes | None:
+    try:
+        return dissolve_to_wkb(geojson_text)
+    except Exception:
+        # Keep the raw layer even if it cannot be pre-processed; readers fall back to GeoJSON.
+        return None
+
+
 def _ensure_date(sess: Session, d: date) -> int:
     row = sess.execute(select(DateRef).where(DateRef.date == d)).scalar_one_or_none()
     if row:
@@ -58,6 +120,51 @@ def _ensure_date(sess: Session, d: date) -> int:
     return obj.id  # type: ignore[attr-defined]
 
 
+def _upsert_layer_in(
+    sess: Session,
+    *,
+    clazz: str,
+    d: date,
+    geojson_text: str,
+    source_url: str | None = None,
+    features_count: int | None = None,
+) -> Layer:
+    """Insert or update one layer inside an open session (flushed, not committed)."""
+    checksum = hashlib.sha256(geojson_text.encode("utf-8")).hexdigest()
+    did = _ensure_date(sess, d)
+    # check existing
+    existing = sess.execute(
+        select(Layer).where(Layer.date_id == did, Layer.clazz == clazz)
+    ).scalar_one_or_none()
+    if existing and existing.checksum == checksum:
+        if existing.wkb_blob is None:
+            # backfill pre-dissolved geometry for rows stored before it existed
+            existing.wkb_blob = _layer_wkb(geojson_text)  # type: ignore[assignment]
+        return existing
+    gz = gzip.compress(geojson_text.encode("utf-8"))
+    wkb_blob = _layer_wkb(geojson_text)
+    if existing:
+        # update existing
+        existing.geojson = gz  # type: ignore[assignment]
+        existing.wkb_blob = wkb_blob  # type: ignore[assignment]
+        existing.features_count = features_count
+        existing.source_url = source_url
+        existing.checksum = checksum
+        return existing
+    obj = Layer(
+        clazz=clazz,
+        date_id=did,
+        source_url=source_url,
+        geojson=gz,
+        wkb_blob=wkb_blob,
+        features_count=features_count,
+        checksum=checksum,
+    )
+    sess.add(obj)
+    sess.flush()
+    return obj
+
+
 def upsert_layer(
     *,
     clazz: str,
@@ -68,37 +175,31 @@ def upsert_layer(
 ) -> int:
     """Store layer GeoJSON (gzipped) with idempotency via checksum."""
     SessionLocal = get_session_maker()
-    checksum = hashlib.sha256(geojson_text.encode("utf-8")).hexdigest()
-    gz = gzip.compress(geojson_text.encode("utf-8"))
     with SessionLocal() as sess:
-        did = _ensure_date(sess, d)
-        # check existing
-        existing = sess.execute(
-            select(Layer).where(Layer.date_id == did, Layer.clazz == clazz)
-        ).scalar_one_or_none()
-        if existing and existing.checksum == checksum:
-            return existing.id  # type: ignore[attr-defined]
-        if existing:
-            # update existing
-            existing.geojson = gz  # type: ignore[assignment]
-            existing.features_count = features_count
-            existing.source_url = source_url
-            existing.checksum = checksum
-            sess.commit()
-            return existing.id  # type: ignore[attr-defined]
-        obj = Layer(
+        obj = _upsert_layer_in(
+            sess,
             clazz=clazz,
-            date_id=did,
+            d=d,
+            geojson_text=geojson_text,
             source_url=source_url,
-            geojson=gz,
             features_count=features_count,
-            checksum=checksum,
         )
-        sess.add(obj)
         sess.commit()
         return obj.id  # type: ignore[attr-defined]
 
 
+def upsert_layers_bulk(rows: Iterable[dict]) -> list[int]:
+    """Store many layers in one transaction.
+
+    Each row has the keyword arguments of `upsert_layer`. Returns layer ids in row order.
+    """
+    SessionLocal = get_session_maker()
+    with SessionLocal() as sess:
+        objs = [_upsert_layer_in(sess, **row) for row in rows]
+        sess.commit()
+        return [obj.id for obj in objs]  # type: ignore[attr-defined]
+
+
 def insert_changes(
     *,
     clazz: str,
@@ -109,26 +210,38 @@ def insert_changes(
     """Insert change patches idempotently using a content hash."""
     SessionLocal = get_session_maker()
     count = 0
+    keyed: list[tuple[str, ChangeItem]] = []
+    for it in items:
+        hsrc = f"{clazz}|{it.status}|{it.centroid[0]:.6f}|{it.centroid[1]:.6f}|{it.area_km2:.4f}|{date_curr.isoformat()}"
+        keyed.append((hashlib.sha256(hsrc.encode("utf-8")).hexdigest(), it))
     with SessionLocal() as sess:
         dprev_id = _ensure_date(sess, date_prev)
         dcurr_id = _ensure_date(sess, date_curr)
-        for it in items:
-            hsrc = f"{clazz}|{it['status']}|{it['centroid'][0]:.6f}|{it['centroid'][1]:.6f}|{it['area_km2']:.4f}|{date_curr.isoformat()}"
-            hkey = hashlib.sha256(hsrc.encode("utf-8")).hexdigest()
-            exists = sess.execute(
-                select(Change).where(Change.hash_key == hkey)
-            ).scalar_one_or_none()
-            if exists:
+        # one lookup per batch of hashes instead of a SELECT per item; batches keep the
+        # IN list under the backend's bind-parameter limit
+        hkeys = [hkey for hkey, _ in keyed]
+        seen: set[str] = set()
+        for start in range(0, len(hkeys), _IN_BATCH_SIZE):
+            batch = hkeys[start : start + _IN_BATCH_SIZE]
+            seen.update(sess.execute(select(Change.hash_key).where(Change.hash_key.in_(batch))).scalars())
+        for hkey, it in keyed:
+            if hkey in seen:
                 continue
+            seen.add(hkey)
+            bbox = it.bbox or (None, None, None, None)
             obj = Change(
                 date_prev_id=dprev_id,
                 date_curr_id=dcurr_id,
                 clazz=clazz,
-                status=it["status"],
-                area_km2=float(it["area_km2"]),
-                centroid_lon=float(it["centroid"][0]),
-                centroid_lat=float(it["centroid"][1]),
-                settlement=it.get("settlement"),
+                status=it.status,
+                area_km2=float(it.area_km2),
+                centroid_lon=float(it.centroid[0]),
+                centroid_lat=float(it.centroid[1]),
+                bbox_minx=bbox[0],
+                bbox_miny=bbox[1],
+                bbox_maxx=bbox[2],
+                bbox_maxy=bbox[3],
+                settlement=it.settlement or None,
                 settlement_distance_km=None,
                 hash_key=hkey,
             )
@@ -142,7 +255,7 @@ def insert_report(*, date_curr: date, text: str, top3: list[ChangeItem] | None =
     SessionLocal = get_session_maker()
     with SessionLocal() as sess:
         did = _ensure_date(sess, date_curr)
-        obj = Report(date_curr_id=did, text=text, top3_json=json.dumps(top3 or []))
+        obj = Report(date_curr_id=did, text=text, top3_json=_dumps([it._asdict() for it in top3 or []]))
         sess.add(obj)
         sess.commit()
         return obj.id  # type: ignore[attr-defined]
@@ -178,7 +291,7 @@ def upsert_change_summary(
                 ChangeSummary.clazz == clazz,
             )
         ).scalar_one_or_none()
-        payload = json.dumps(top_items, ensure_ascii=False)
+        payload = _dumps([it._asdict() for it in top_items])
         if existing:
             existing.gained_km2 = float(gained_km2)  # type: ignore[assignment]
             existing.lost_km2 = float(lost_km2)  # type: ignore[assignment]
@@ -198,6 +311,50 @@ def upsert_change_summary(
         return obj.id  # type: ignore[attr-defined]
 
 
+def upsert_change_summaries_bulk(rows: Iterable[dict]) -> int:
+    """Upsert many cached summaries in one transaction.
+
+    Each row has the keyword arguments of `upsert_change_summary`
+    (clazz, date_prev, date_curr, gained_km2, lost_km2, top_items).
+    Returns the number of rows written.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    SessionLocal = get_session_maker()
+    with SessionLocal() as sess:
+        date_ids: dict[date, int] = {}
+        for row in rows:
+            for d in (row["date_prev"], row["date_curr"]):
+                if d not in date_ids:
+                    date_ids[d] = _ensure_date(sess, d)
+        # Load every existing summary the batch can hit with a single SELECT.
+        ids = list(date_ids.values())
+        existing = {
+            (obj.date_prev_id, obj.date_curr_id, obj.clazz): obj
+            for obj in sess.execute(
+                select(ChangeSummary).where(
+                    ChangeSummary.date_prev_id.in_(ids),
+                    ChangeSummary.date_curr_id.in_(ids),
+                    ChangeSummary.clazz.in_({row["clazz"] for row in rows}),
+                )
+            ).scalars()
+        }
+        for row in rows:
+            key = (date_ids[row["date_prev"]], date_ids[row["date_curr"]], row["clazz"])
+            payload = _dumps([it._asdict() for it in row["top_items"]])
+            obj = existing.get(key)
+            if obj is None:
+                obj = ChangeSummary(date_prev_id=key[0], date_curr_id=key[1], clazz=key[2])
+                sess.add(obj)
+                existing[key] = obj
+            obj.gained_km2 = float(row["gained_km2"])  # type: ignore[assignment]
+            obj.lost_km2 = float(row["lost_km2"])  # type: ignore[assignment]
+            obj.top_json = payload  # type: ignore[assignment]
+        sess.commit()
+    return len(rows)
+
+
 def get_change_summary(
     *, clazz: str, date_prev: date, date_curr: date
 ) -> tuple[float, float, list[ChangeItem]] | None:
@@ -221,12 +378,61 @@ def get_change_summary(
         top_items: list[ChangeItem] = []
         if top_json:
             try:
-                top_items = json.loads(top_json)
+                top_items = [_item_from_json(d) for d in _loads(top_json)]
             except Exception:
                 top_items = []
         return float(gained), float(lost), top_items
 
 
+def list_change_summaries(
+    keys: Iterable[tuple[str, date, date]],
+) -> dict[tuple[str, date, date], tuple[float, float, list[ChangeItem]]]:
+    """Fetch cached summaries for many (clazz, date_prev, date_curr) keys in one query.
+
+    Keys without a cached row are absent from the result.
+    """
+    wanted = set(keys)
+    if not wanted:
+        return {}
+    SessionLocal = get_session_maker()
+    with SessionLocal() as sess:
+        prev = sa.orm.aliased(DateRef)
+        curr = sa.orm.aliased(DateRef)
+        # Filter on each component and narrow to the exact keys below; this is a
+        # superset of a row-value IN and works the same on MySQL and SQLite.
+        stmt = (
+            select(
+                ChangeSummary.clazz,
+                prev.date,
+                curr.date,
+                ChangeSummary.gained_km2,
+                ChangeSummary.lost_km2,
+                ChangeSummary.top_json,
+            )
+            .select_from(ChangeSummary)
+            .join(prev, prev.id == ChangeSummary.date_prev_id)
+            .join(curr, curr.id == ChangeSummary.date_curr_id)
+            .where(
+                ChangeSummary.clazz.in_({k[0] for k in wanted}),
+                prev.date.in_({k[1] for k in wanted}),
+                curr.date.in_({k[2] for k in wanted}),
+            )
+        )
+        out: dict[tuple[str, date, date], tuple[float, float, list[ChangeItem]]] = {}
+        for clazz, dprev, dcurr, gained, lost, top_json in sess.execute(stmt):
+            key = (clazz, dprev, dcurr)
+            if key not in wanted:
+                continue
+            top_items: list[ChangeItem] = []
+            if top_json:
+                try:
+                    top_items = [_item_from_json(d) for d in _loads(top_json)]
+                except Exception:
+                    top_items = []
+            out[key] = (float(gained), float(lost), top_items)
+        return out
+
+
 def list_cached_pairs(*, date_from: date, date_to: date) -> list[tuple[date, date]]:
     """List distinct (prev_date, curr_date) pairs available in change_summaries within range."""
     SessionLocal = get_session_maker()
@@ -259,3 +465,18 @@ def list_layer_dates(*, clazz: str | None = None) -> list[date]:
         stmt = stmt.distinct().order_by(DateRef.date.asc())
         rows = sess.execute(stmt).scalars().all()
         return list(rows)
+
+
+def get_layer_checksums(*, clazzes: Iterable[str], dates: Iterable[date]) -> dict[tuple[str, date], str | None]:
+    """Return {(clazz, date): checksum} for the stored layers among the given classes and dates."""
+    clazzes, dates = list(clazzes), list(dates)
+    if not clazzes or not dates:
+        return {}
+    SessionLocal = get_session_maker()
+    with SessionLocal() as sess:
+        stmt = (
+            select(Layer.clazz, DateRef.date, Layer.checksum)
+            .join(DateRef, DateRef.id == Layer.date_id)
+            .where(Layer.clazz.in_(clazzes), DateRef.date.in_(dates))
+        )
+        return {(clazz, d): checksum for clazz, d, checksum in sess.execute(stmt)}
@@ -22,6 +22,8 @@ class Layer(Base):
     date_id: Mapped[int] = mapped_column(ID_BIGINT, ForeignKey("dates.id"), nullable=False)
     source_url: Mapped[str | None] = mapped_column(String(512))
     geojson: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Dissolved polygons as Hilbert-ordered WKB (see geo_changes.dissolve_to_wkb).
+    wkb_blob: Mapped[bytes | None] = mapped_column(LargeBinary)
     features_count: Mapped[int | None] = mapped_column(Integer)
     checksum: Mapped[str | None] = mapped_column(String(64))
     created_at: Mapped[str] = mapped_column(DateTime, server_default=func.now())
@@ -41,6 +43,11 @@ class Change(Base):
     area_km2: Mapped[float] = mapped_column(Float, nullable=False)
     centroid_lon: Mapped[float] = mapped_column(Float, nullable=False)
     centroid_lat: Mapped[float] = mapped_column(Float, nullable=False)
+    # Patch bounding box (lon/lat) for range queries without touching geometry.
+    bbox_minx: Mapped[float | None] = mapped_column(Float)
+    bbox_miny: Mapped[float | None] = mapped_column(Float)
+    bbox_maxx: Mapped[float | None] = mapped_column(Float)
+    bbox_maxy: Mapped[float | None] = mapped_column(Float)
     settlement: Mapped[str | None] = mapped_column(String(128))
     settlement_distance_km: Mapped[float | None] = mapped_column(Float)
     hash_key: Mapped[str | None] = mapped_column(String(64))
@@ -48,6 +55,7 @@ class Change(Base):
 
     __table_args__ = (
         Index("idx_changes_date_class", "date_curr_id", "clazz", "status"),
+        Index("idx_changes_centroid", "centroid_lat", "centroid_lon"),
     )
 
 
@@ -0,0 +1,83 @@
+"""Vectorized forward projections from WGS84 lon/lat.
+
+Only the two projections used by change detection are implemented: UTM (EPSG:326xx/327xx)
+via the 6th-order Krüger series, and EASE-Grid 2.0 cylindrical equal-area (EPSG:6933).
+Both operate on flat float64 arrays in a handful of numpy calls, avoiding pyproj's
+per-call setup; results agree with PROJ to well below a millimetre.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# WGS84 ellipsoid
+_A = 6378137.0
+_F = 1 / 298.257223563
+_E2 = _F * (2 - _F)
+_E = np.sqrt(_E2)
+
+# Transverse Mercator (Krüger n-series, Karney 2011)
+_N = _F / (2 - _F)
+_RECT_A = _A / (1 + _N) * (1 + _N**2 / 4 + _N**4 / 64 + _N**6 / 256)
+_ALPHA = np.array(
+    [
+        _N / 2 - 2 * _N**2 / 3 + 5 * _N**3 / 16 + 41 * _N**4 / 180 - 127 * _N**5 / 288
+        + 7891 * _N**6 / 37800,
+        13 * _N**2 / 48 - 3 * _N**3 / 5 + 557 * _N**4 / 1440 + 281 * _N**5 / 630
+        - 1983433 * _N**6 / 1935360,
+        61 * _N**3 / 240 - 103 * _N**4 / 140 + 15061 * _N**5 / 26880 + 167603 * _N**6 / 181440,
+        49561 * _N**4 / 161280 - 179 * _N**5 / 168 + 6601661 * _N**6 / 7257600,
+        34729 * _N**5 / 80640 - 3418889 * _N**6 / 1995840,
+        212378941 * _N**6 / 319334400,
+    ]
+)
+_UTM_K0 = 0.9996
+_UTM_FE = 500000.0
+_UTM_FN_SOUTH = 10000000.0
+
+# EASE-Grid 2.0 (EPSG:6933): Lambert cylindrical equal-area, standard parallel 30°
+_CEA_SIN_PHI_TS = np.sin(np.radians(30.0))
+_CEA_K0 = np.cos(np.radians(30.0)) / np.sqrt(1 - _E2 * _CEA_SIN_PHI_TS**2)
+
+
+def utm_epsg_params(epsg: int) -> tuple[int, bool] | None:
+    """Return (zone, north) for a WGS84 UTM EPSG code, or None for other codes."""
+
+    if 32601 <= epsg <= 32660:
+        return epsg - 32600, True
+    if 32701 <= epsg <= 32760:
+        return epsg - 32700, False
+    return None
+
+
+def utm_fwd(lon: np.ndarray, lat: np.ndarray, zone: int, north: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Project lon/lat degrees to UTM easting/northing in metres."""
+
+    lam = np.radians(np.asarray(lon, dtype=np.float64) - (zone * 6 - 183))
+    phi = np.radians(np.asarray(lat, dtype=np.float64))
+    sin_phi = np.sin(phi)
+    # conformal latitude (as tan)
+    t = np.sinh(np.arctanh(sin_phi) - _E * np.arctanh(_E * sin_phi))
+    xi_p = np.arctan2(t, np.cos(lam))
+    eta_p = np.arctanh(np.sin(lam) / np.sqrt(1 + t * t))
+    xi = xi_p.copy()
+    eta = eta_p.copy()
+    for j, alpha in enumerate(_ALPHA, start=1):
+        xi += alpha * np.sin(2 * j * xi_p) * np.cosh(2 * j * eta_p)
+        eta += alpha * np.cos(2 * j * xi_p) * np.sinh(2 * j * eta_p)
+    x = _UTM_FE + _UTM_K0 * _RECT_A * eta
+    y = _UTM_K0 * _RECT_A * xi
+    if not north:
+        y = y + _UTM_FN_SOUTH
+    return x, y
+
+
+def cea_fwd(lon: np.ndarray, lat: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Project lon/lat degrees to EPSG:6933 (EASE-Grid 2.0 global) metres."""
+
+    lam = np.radians(np.asarray(lon, dtype=np.float64))
+    sin_phi = np.sin(np.radians(np.asarray(lat, dtype=np.float64)))
+    q = (1 - _E2) * (
+        sin_phi / (1 - _E2 * sin_phi**2) - np.log((1 - _E * sin_phi) / (1 + _E * sin_phi)) / (2 * _E)
+    )
+    return _A * _CEA_K0 * lam, _A * q / (2 * _CEA_K0)
@@ -5,7 +5,7 @@ This module computes patch-level differences (gained/lost) between two daily lay
 Quality improvements over the initial skeleton:
 - Robust loading of GeoJSON (FeatureCollection / (Multi)Polygon)
 - Geometry validation/repair (make_valid / buffer(0) fallback)
-- Area computation in km^2 using a local UTM projection (pyproj) when available
+- Area computation in km^2 using a local UTM projection (built-in numpy kernel)
 
 Note: direction/settlement enrichment is done by the pipeline layer.
 """
@@ -13,11 +13,19 @@ Note: direction/settlement enrichment is done by the pipeline layer.
 from __future__ import annotations
 
 import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import TypedDict
+from typing import NamedTuple
 
+import numpy as np
+import shapely
 from shapely.geometry import shape
-from shapely.ops import transform, unary_union
+from shapely.ops import unary_union
+
+from src.domain._proj_kernels import cea_fwd, utm_epsg_params, utm_fwd
 
 try:
     from shapely.validation import make_valid  # Shapely >= 2
@@ -29,63 +37,168 @@ try:
 except Exception:  # pragma: no cover
     pyproj = None  # type: ignore[assignment]
 
+_PYPROJ_AVAILABLE = pyproj is not None
+
+# Failures of a projection/overlay round trip that callers fall back from; resource errors
+# such as MemoryError are not among them and propagate.
+_PROJECTION_ERRORS: tuple[type[Exception], ...] = (ValueError, shapely.errors.GEOSException)
+if _PYPROJ_AVAILABLE:
+    _PROJECTION_ERRORS += (pyproj.exceptions.ProjError,)
+
 WGS84_EPSG = 4326
+CEA_EPSG = 6933
+EARTH_RADIUS_KM = 6371.0
+
+# Features per repair/dissolve batch when loading large layers.
+_LOAD_CHUNK_SIZE = 4096
+
+# Runs one of the two overlays of each compute_changes call. Shared by the process, so
+# callers that are themselves parallel (period reports) add at most cpu_count threads.
+_OVERLAY_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="overlay")
+
+# Index order used for the per-patch status column in compute_changes.
+_STATUSES = ("gained", "lost")
+
+
+@lru_cache(maxsize=16)
+def _cached_transformer(src_epsg: int, dst_epsg: int):
+    """Return a shared always_xy Transformer for an EPSG pair (construction is expensive)."""
+
+    return pyproj.Transformer.from_crs(f"EPSG:{src_epsg}", f"EPSG:{dst_epsg}", always_xy=True)
+
+
+def _forward_kernel(src_epsg: int, dst_epsg: int):
+    """Return a numpy lon/lat -> metres kernel for the pair, or None if PROJ is needed."""
+
+    if src_epsg != WGS84_EPSG:
+        return None
+    if dst_epsg == CEA_EPSG:
+        return cea_fwd
+    utm = utm_epsg_params(dst_epsg)
+    if utm is None:
+        return None
+    zone, north = utm
+    return lambda x, y: utm_fwd(x, y, zone, north)
+
+
+def project_xy(x, y, src_epsg: int, dst_epsg: int) -> tuple[np.ndarray, np.ndarray]:
+    """Project coordinate arrays (or scalars) between EPSG codes.
+
+    WGS84 -> UTM / EPSG:6933 uses the numpy kernels from `_proj_kernels`; other pairs go
+    through a cached pyproj Transformer.
+    """
+
+    if src_epsg == dst_epsg:
+        return np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    fwd = _forward_kernel(src_epsg, dst_epsg)
+    if fwd is None:
+        fwd = _cached_transformer(src_epsg, dst_epsg).transform
+    return fwd(x, y)
+
 
+def _reproject(geom, src_epsg: int, dst_epsg: int):
+    """Reproject a geometry (or array of geometries) between EPSG codes (see `project_xy`)."""
 
-class ChangeItem(TypedDict, total=False):
-    direction: str
-    settlement: str
-    settlement_distance_km: float
+    if src_epsg == dst_epsg:
+        return geom
+
+    def _tx(coords: np.ndarray) -> np.ndarray:
+        # One call over the flat coordinate array instead of a per-vertex callback.
+        x, y = project_xy(coords[:, 0], coords[:, 1], src_epsg, dst_epsg)
+        return np.column_stack([x, y])
+
+    return shapely.transform(geom, _tx)
+
+
+@lru_cache(maxsize=256)
+def _km_per_deg_lon(deg_bucket: int) -> float:
+    """Approximate km per degree of longitude for a one-degree latitude bucket."""
+
+    return 111.320 * abs(math.cos(math.radians(deg_bucket + 0.5)))
+
+
+class ChangeItem(NamedTuple):
     status: str  # "gained" | "lost"
     area_km2: float
     centroid: tuple[float, float]  # lon, lat
+    bbox: tuple[float, float, float, float] | None = None  # minx, miny, maxx, maxy (lon/lat)
+    # enrichment, filled in by the pipeline layer
+    direction: str = ""
+    settlement: str = ""
+    settlement_distance_km: float | None = None
 
 
-def _load_geom(obj: str):
-    """Load a unified geometry (dissolved) from a file path or GeoJSON string."""
-
-    # `obj` can be either a filesystem path or a GeoJSON string.
-    # Avoid calling Path(...).exists() on a long JSON string (can raise OSError on some OSes).
-    is_probably_path = (
-        "{" not in obj
-        and "\n" not in obj
-        and len(obj) < 300
-    )
-    if is_probably_path:
-        try:
-            p = Path(obj)
-            if p.exists():
-                with open(p, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            else:
-                data = json.loads(obj)
-        except OSError:
-            data = json.loads(obj)
-    else:
+def _load_geom(obj: str | bytes):
+    """Load a unified geometry (dissolved) from a file path, GeoJSON string or WKB bytes."""
+
+    if isinstance(obj, bytes):
+        # Pre-dissolved layer produced by `dissolve_to_wkb`.
+        return shapely.from_wkb(obj)
+
+    # `obj` can be either a filesystem path or a GeoJSON string. JSON text starts with
+    # "{" or "[" (after optional whitespace); anything else is treated as a path, so the
+    # common in-memory case needs no filesystem probe.
+    if obj[:64].lstrip()[:1] in ("{", "["):
         data = json.loads(obj)
+    else:
+        data = json.loads(Path(obj).read_bytes())
 
     if not isinstance(data, dict):
         raise ValueError("Unsupported GeoJSON format: expected dict")
 
-    geoms = []
+    geom_dicts: list[dict] = []
     t = data.get("type")
 
     if t == "FeatureCollection":
         for feat in data.get("features", []):
             geom = feat.get("geometry") if isinstance(feat, dict) else None
             if isinstance(geom, dict):
-                geoms.append(shape(geom))
+                geom_dicts.append(geom)
     elif t in {"Polygon", "MultiPolygon"}:
-        geoms.append(shape(data))
+        geom_dicts.append(data)
     else:
         # ignore empty/unsupported collections
         if t not in {"GeometryCollection"}:
             raise ValueError("Unsupported GeoJSON format: expected FeatureCollection or (Multi)Polygon")
 
-    if not geoms:
+    if not geom_dicts:
         return None
 
-    return unary_union(geoms)
+    # Build, repair and dissolve in fixed-size chunks, then dissolve the partial unions:
+    # only one chunk of shapely geometries is alive at a time.
+    partials = []
+    for start in range(0, len(geom_dicts), _LOAD_CHUNK_SIZE):
+        chunk = np.array([shape(g) for g in geom_dicts[start : start + _LOAD_CHUNK_SIZE]], dtype=object)
+        if make_valid is not None:
+            chunk = shapely.make_valid(chunk)
+        partials.append(shapely.unary_union(chunk))
+    if len(partials) == 1:
+        return partials[0]
+    return shapely.unary_union(np.array(partials, dtype=object))
+
+
+def _hilbert_order(x: np.ndarray, y: np.ndarray, level: int = 16) -> np.ndarray:
+    """Return the permutation that sorts points along a Hilbert curve over their extent."""
+
+    n = 1 << level
+    span_x = float(x.max() - x.min()) or 1.0
+    span_y = float(y.max() - y.min()) or 1.0
+    xi = ((x - x.min()) / span_x * (n - 1)).astype(np.int64)
+    yi = ((y - y.min()) / span_y * (n - 1)).astype(np.int64)
+    d = np.zeros_like(xi)
+    s = n >> 1
+    while s > 0:
+        rx = ((xi & s) > 0).astype(np.int64)
+        ry = ((yi & s) > 0).astype(np.int64)
+        d += s * s * ((3 * rx) ^ ry)
+        # rotate the quadrant so the curve stays continuous
+        flip = (ry == 0) & (rx == 1)
+        xi = np.where(flip, n - 1 - xi, xi)
+        yi = np.where(flip, n - 1 - yi, yi)
+        swap = ry == 0
+        xi, yi = np.where(swap, yi, xi), np.where(swap, xi, yi)
+        s >>= 1
+    return np.argsort(d, kind="stable")
 
 
 def _split_parts(geom) -> list:
@@ -107,7 +220,12 @@ def _fix_validity(geom):
     # Shapely 2: make_valid can return a GeometryCollection
     try:
         if make_valid is not None:
-            geom = make_valid(geom)
+            parts = getattr(geom, "geoms", None)
+            if parts is not None and not geom.is_valid:
+                # Multi-part: repair all parts in one vectorized call, then re-dissolve.
+                geom = shapely.unary_union(shapely.make_valid(np.array(list(parts), dtype=object)))
+            else:
+                geom = make_valid(geom)
     except Exception:
         pass
 
@@ -121,16 +239,38 @@ def _fix_validity(geom):
     return geom
 
 
+def dissolve_to_wkb(geojson: str) -> bytes | None:
+    """Dissolve a layer once and serialize its polygons as Hilbert-ordered 2D WKB.
+
+    The result can be passed to `compute_changes` in place of the GeoJSON text, which
+    skips JSON parsing, repair and dissolve on every comparison. Returns None for
+    layers without polygonal area.
+    """
+
+    geom = _fix_validity(_load_geom(geojson))
+    if geom is None or geom.is_empty:
+        return None
+    # Flatten (Multi)Polygons and GeometryCollections down to single polygons.
+    parts = shapely.get_parts(shapely.get_parts(geom))
+    parts = parts[shapely.get_type_id(parts) == 3]
+    if parts.size == 0:
+        return None
+    cents = shapely.centroid(parts)
+    parts = parts[_hilbert_order(shapely.get_x(cents), shapely.get_y(cents))]
+    return shapely.to_wkb(shapely.multipolygons(parts), output_dimension=2)
+
+
 def _local_utm_epsg(lon: float, lat: float) -> int:
     zone = int((lon + 180) // 6) + 1
     return (32600 if lat >= 0 else 32700) + zone
 
 
-def _area_km2(geom) -> float:
+def _area_km2(geom, rep_point=None) -> float:
     """Compute area in km^2.
 
-    Prefer local UTM meters-based area if pyproj is available.
-    Fallback to a rough lon/lat conversion otherwise.
+    Prefer local UTM meters-based area (projected with the built-in UTM kernel).
+    Fallback to a rough lon/lat conversion if projection fails.
+    `rep_point` (precomputed interior point) avoids recomputing it for UTM zone selection.
     """
 
     if geom is None or geom.is_empty:
@@ -140,39 +280,130 @@ def _area_km2(geom) -> float:
     if geom is None or geom.is_empty:
         return 0.0
 
-    if pyproj is not None:
-        c = geom.representative_point()
-        epsg = _local_utm_epsg(float(c.x), float(c.y))
-        try:
-            transformer = pyproj.Transformer.from_crs(
-                f"EPSG:{WGS84_EPSG}", f"EPSG:{epsg}", always_xy=True
-            ).transform
-            g_m = transform(transformer, geom)
-            return float(g_m.area) / 1_000_000.0
-        except Exception:
-            pass
+    c = rep_point if rep_point is not None else geom.representative_point()
+    epsg = _local_utm_epsg(float(c.x), float(c.y))
+    try:
+        g_m = _reproject(geom, WGS84_EPSG, epsg)
+        return float(g_m.area) / 1_000_000.0
+    except Exception:
+        pass
 
     # Fallback: approximate using km per degree at mid-lat
     minx, miny, maxx, maxy = geom.bounds
-    import math
-
     lat_mid = (miny + maxy) / 2.0
     km_per_deg_lat = 110.574
-    km_per_deg_lon = 111.320 * abs(math.cos(math.radians(lat_mid)))
+    km_per_deg_lon = _km_per_deg_lon(math.floor(lat_mid))
     width_km = max(0.0, (maxx - minx)) * km_per_deg_lon
     height_km = max(0.0, (maxy - miny)) * km_per_deg_lat
     return width_km * height_km
 
 
+def _haversine_km(lon1, lat1, lon2, lat2) -> np.ndarray:
+    """Element-wise great-circle distances (km) between lon/lat points."""
+
+    lon1, lat1, lon2, lat2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lon1, lat1, lon2, lat2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def _neighbour_pairs(points: np.ndarray, distance: float) -> tuple[np.ndarray, np.ndarray]:
+    """Index pairs (i < j) of points within planar `distance`, via an STRtree (no n x n matrix)."""
+
+    i, j = shapely.STRtree(points).query(points, predicate="dwithin", distance=distance)
+    keep = i < j
+    return i[keep], j[keep]
+
+
+def _proximity_groups(n: int, pairs_i: np.ndarray, pairs_j: np.ndarray) -> list[list[int]]:
+    """Connected components (union-find) of `n` nodes joined by the given index pairs."""
+
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(pairs_i.tolist(), pairs_j.tolist(), strict=True):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[rj] = ri
+
+    groups: dict[int, list[int]] = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def _geodesic_groups(cents: np.ndarray, dist_km: float) -> list[list[int]]:
+    """Proximity groups by great-circle distance between lon/lat points.
+
+    The STRtree works in degrees, so it is queried with a radius that bounds `dist_km` at
+    the highest latitude present; candidate pairs are then checked with the haversine.
+    """
+
+    lon, lat = shapely.get_x(cents), shapely.get_y(cents)
+    d = dist_km / EARTH_RADIUS_KM  # radians
+    lat_max = min(float(np.abs(np.radians(lat)).max()) + d, math.radians(89.9))
+    dlon = 2 * math.asin(min(1.0, math.sin(d / 2) / math.cos(lat_max)))
+    i, j = _neighbour_pairs(cents, math.degrees(math.hypot(d, dlon)))
+    close = _haversine_km(lon[i], lat[i], lon[j], lat[j]) <= dist_km
+    return _proximity_groups(len(cents), i[close], j[close])
+
+
+def _cluster_parts(parts: np.ndarray, cents: np.ndarray, *, dist_km: float) -> list:
+    """Merge patches whose interior points lie within `dist_km` of each other."""
+
+    if len(parts) == 0:
+        return []
+    # Without pyproj there is no inverse UTM projection: cluster by great-circle distance in lon/lat.
+    if not _PYPROJ_AVAILABLE:
+        return [unary_union(list(parts[g])) for g in _geodesic_groups(cents, dist_km)]
+    # Zone from the mean of the patch points: no need to dissolve all parts first.
+    c0 = shapely.centroid(shapely.multipoints(cents))
+    epsg = _local_utm_epsg(float(c0.x), float(c0.y))
+    try:
+        parts_m = _reproject(parts, WGS84_EPSG, epsg)
+        # Cluster by centroid distance (connected components in a proximity graph).
+        cents_m = _reproject(cents, WGS84_EPSG, epsg)
+        groups = _proximity_groups(len(parts), *_neighbour_pairs(cents_m, dist_km * 1000.0))
+        return [_reproject(unary_union(list(parts_m[g])), epsg, WGS84_EPSG) for g in groups]
+    except _PROJECTION_ERRORS:
+        return parts
+
+
+def _areas_km2(parts: np.ndarray, cents: np.ndarray) -> np.ndarray:
+    """Vectorized area in km^2 for all patches of one change-set.
+
+    A daily change-set covers a bounded region, so a single local UTM zone (picked from
+    the mean of the patch interior points) serves all patches: one Transformer, one
+    batched coordinate transform and one vectorized area call.
+    """
+
+    if len(parts) == 0:
+        return np.zeros(0)
+    c0 = shapely.centroid(shapely.multipoints(cents))
+    epsg = _local_utm_epsg(float(c0.x), float(c0.y))
+    try:
+        if make_valid is not None:
+            parts = shapely.make_valid(parts)
+        return shapely.area(_reproject(parts, WGS84_EPSG, epsg)) / 1_000_000.0
+    except Exception:
+        pass
+    return np.array([_area_km2(p, c) for p, c in zip(parts, cents, strict=True)], dtype=float)
+
+
 def compute_changes(
-    prev_geojson: str,
-    curr_geojson: str,
+    prev_geojson: str | bytes,
+    curr_geojson: str | bytes,
     *,
     min_area_km2: float = 0.01,
     cluster_distance_km: float | None = None,
 ) -> list[ChangeItem]:
     """Compute patch-level changes between two same-category layers.
 
+    Inputs are file paths, GeoJSON text, or WKB from `dissolve_to_wkb`.
     Returns gained and lost patches with centroid (lon,lat) and area_km2.
     """
 
@@ -190,117 +421,49 @@ def compute_changes(
         added = None
         removed = prev_geom
     else:
-        added = curr_geom.difference(prev_geom)
+        # Shapely 2 releases the GIL inside GEOS calls: one overlay runs on the shared
+        # pool while the calling thread computes the other.
+        added_f = _OVERLAY_POOL.submit(curr_geom.difference, prev_geom)
         removed = prev_geom.difference(curr_geom)
+        added = added_f.result()
 
-    items: list[ChangeItem] = []
-
-    def _cluster_parts(parts: list, *, dist_km: float) -> list:
-        if not parts:
-            return []
-        # If pyproj is unavailable, fall back to centroid-distance clustering in lon/lat.
-        if pyproj is None:
-            import math
-
-            cent = [p.representative_point() for p in parts]
-            n = len(cent)
-            parent = list(range(n))
-
-            def find(i: int) -> int:
-                while parent[i] != i:
-                    parent[i] = parent[parent[i]]
-                    i = parent[i]
-                return i
-
-            def union(i: int, j: int) -> None:
-                ri, rj = find(i), find(j)
-                if ri != rj:
-                    parent[rj] = ri
-
-            def hav_km(a, b) -> float:
-                # haversine
-                lon1, lat1 = float(a.x), float(a.y)
-                lon2, lat2 = float(b.x), float(b.y)
-                dlon = math.radians(lon2 - lon1)
-                dlat = math.radians(lat2 - lat1)
-                x = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
-                c = 2 * math.atan2(math.sqrt(x), math.sqrt(1 - x))
-                return 6371.0 * c
-
-            for i in range(n):
-                for j in range(i + 1, n):
-                    if hav_km(cent[i], cent[j]) <= float(dist_km):
-                        union(i, j)
-
-            groups: dict[int, list] = {}
-            for i in range(n):
-                groups.setdefault(find(i), []).append(parts[i])
-
-            return [unary_union(mems) for mems in groups.values()]
-        all_union = unary_union(parts)
-        c0 = all_union.representative_point()
-        epsg = _local_utm_epsg(float(c0.x), float(c0.y))
-        try:
-            to_m = pyproj.Transformer.from_crs(f"EPSG:{WGS84_EPSG}", f"EPSG:{epsg}", always_xy=True).transform
-            to_ll = pyproj.Transformer.from_crs(f"EPSG:{epsg}", f"EPSG:{WGS84_EPSG}", always_xy=True).transform
-            buf_m = float(dist_km) * 1000.0
-            parts_m = [transform(to_m, p) for p in parts]
-
-            # Cluster by centroid distance (connected components in a proximity graph).
-            centroids = [p.representative_point() for p in parts_m]
-            n = len(parts_m)
-            parent = list(range(n))
-
-            def find(i: int) -> int:
-                while parent[i] != i:
-                    parent[i] = parent[parent[i]]
-                    i = parent[i]
-                return i
-
-            def union(i: int, j: int) -> None:
-                ri, rj = find(i), find(j)
-                if ri != rj:
-                    parent[rj] = ri
-
-            for i in range(n):
-                for j in range(i + 1, n):
-                    if centroids[i].distance(centroids[j]) <= buf_m:
-                        union(i, j)
-
-            groups: dict[int, list] = {}
-            for i in range(n):
-                groups.setdefault(find(i), []).append(parts_m[i])
-
-            clustered_ll = [transform(to_ll, unary_union(mems)) for mems in groups.values()]
-            return clustered_ll
-        except Exception:
-            return parts
-
-    def mk_items(geom, status: str) -> None:
+    def mk_patches(geom) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return parallel (parts, interior points, areas) arrays for one side of the diff."""
         if geom is None or geom.is_empty:
-            return
-        parts = _split_parts(geom)
+            return np.empty(0, dtype=object), np.empty(0, dtype=object), np.zeros(0)
+        parts = np.array(_split_parts(geom), dtype=object)
+        # Interior points are computed once per patch and reused for zone selection,
+        # clustering and the reported centroid.
+        cents = shapely.point_on_surface(parts)
         if cluster_distance_km is not None and cluster_distance_km > 0:
-            parts = _cluster_parts(parts, dist_km=float(cluster_distance_km))
-        for part in parts:
-            if part.is_empty:
-                continue
-            area_km2 = _area_km2(part)
-            if area_km2 < min_area_km2:
-                continue
-            c = part.representative_point()
-            items.append(
-                ChangeItem(
-                    direction="",
-                    settlement="",
-                    status=status,
-                    area_km2=round(float(area_km2), 4),
-                    centroid=(float(c.x), float(c.y)),
-                )
-            )
-
-    mk_items(added, "gained")
-    mk_items(removed, "lost")
-
-    items.sort(key=lambda x: x["area_km2"], reverse=True)
-    return items
+            parts = np.array(_cluster_parts(parts, cents, dist_km=float(cluster_distance_km)), dtype=object)
+            cents = shapely.point_on_surface(parts)
+        keep = ~shapely.is_empty(parts)
+        parts, cents = parts[keep], cents[keep]
+        return parts, cents, _areas_km2(parts, cents)
+
+    # Accumulate patches column-wise (gained first, then lost) and filter/sort in numpy;
+    # ChangeItems are only built for the rows that survive.
+    sides = [mk_patches(added), mk_patches(removed)]
+    parts = np.concatenate([side[0] for side in sides])
+    cents = np.concatenate([side[1] for side in sides])
+    areas = np.concatenate([side[2] for side in sides])
+    statuses = np.repeat(np.arange(len(_STATUSES), dtype=np.uint8), [len(side[0]) for side in sides])
+
+    mask = areas >= min_area_km2
+    parts, cents, statuses = parts[mask], cents[mask], statuses[mask]
+    areas = np.round(areas[mask], 4)
+    order = np.argsort(-areas, kind="stable")
+
+    lons = shapely.get_x(cents)
+    lats = shapely.get_y(cents)
+    bounds = shapely.bounds(parts)
+    return [
+        ChangeItem(
+            status=_STATUSES[statuses[i]],
+            area_km2=float(areas[i]),
+            centroid=(float(lons[i]), float(lats[i])),
+            bbox=tuple(float(v) for v in bounds[i]),
+        )
+        for i in order
+    ]
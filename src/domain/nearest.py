@@ -1,11 +1,21 @@
 from __future__ import annotations
-from typing import Optional, Tuple, Any
+
+import os
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from src.domain.geo_changes import CEA_EPSG, WGS84_EPSG, project_xy
+
 try:
     import geopandas as gpd  # type: ignore
+    import shapely  # type: ignore
     from shapely.geometry import Point  # type: ignore
     _GEOS = True
 except Exception:  # pragma: no cover
     gpd = None  # type: ignore
+    shapely = None  # type: ignore
     Point = None  # type: ignore
     _GEOS = False
 
@@ -14,12 +24,62 @@ try:
 except Exception:  # pragma: no cover
     Nominatim = None  # type: ignore
 
+# Equal-area projection used for distance lookups against the gazetteer (numpy kernel).
+METRIC_EPSG = CEA_EPSG
+
+
+class _ById:
+    """Hashable identity wrapper so an (unhashable) GeoDataFrame can key an lru_cache.
+
+    The cache holds a strong reference to the wrapped object, so its id cannot be reused
+    while the entry is alive.
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __hash__(self) -> int:
+        return id(self.obj)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ById) and other.obj is self.obj
+
+
+@lru_cache(maxsize=4)
+def _gaz_in_metric(key: _ById):
+    """Reproject a gazetteer to METRIC_EPSG once and build its spatial index."""
+    gaz_m = key.obj.to_crs(epsg=METRIC_EPSG)
+    return gaz_m, gaz_m.sindex
+
+
+def gazetteer_version(path: str) -> tuple[str, int, int]:
+    """Identify the current contents of a gazetteer file: (path, size, mtime_ns)."""
+    st = os.stat(path)
+    return os.fspath(path), st.st_size, st.st_mtime_ns
+
 
 def load_gazetteer_csv(path: str, name_col: str = "name", lon_col: str = "lon", lat_col: str = "lat"):
     """Load a simple gazetteer CSV with columns: name, lon, lat -> GeoDataFrame in WGS84.
 
     If geopandas is unavailable, returns a list of tuples (name, lon, lat).
+    The result is cached per file version (see `gazetteer_version`): repeated calls return
+    the same object, so its metric projection and spatial index are built once. Callers
+    must not modify it.
     """
+    return load_gazetteer_version(gazetteer_version(path), name_col, lon_col, lat_col)
+
+
+def load_gazetteer_version(
+    version: tuple[str, int, int], name_col: str = "name", lon_col: str = "lon", lat_col: str = "lat"
+):
+    """`load_gazetteer_csv` for a version from `gazetteer_version`, without a new stat()."""
+    return _load_gazetteer_csv(*version, name_col, lon_col, lat_col)
+
+
+@lru_cache(maxsize=4)
+def _load_gazetteer_csv(path: str, size: int, mtime_ns: int, name_col: str, lon_col: str, lat_col: str):
     import pandas as pd  # lightweight dependency
     df = pd.read_csv(path)
     if _GEOS and gpd is not None:
@@ -30,10 +90,12 @@ def load_gazetteer_csv(path: str, name_col: str = "name", lon_col: str = "lon",
         )
         return gdf[[name_col, "geometry"]].rename(columns={name_col: "name"})
     # fallback: return simple list
-    return list(zip(df[name_col].astype(str), df[lon_col].astype(float), df[lat_col].astype(float)))
+    return list(
+        zip(df[name_col].astype(str), df[lon_col].astype(float), df[lat_col].astype(float), strict=True)
+    )
 
 
-def nearest_from_gazetteer(lon: float, lat: float, gazetteer) -> Optional[Tuple[str, float]]:
+def nearest_from_gazetteer(lon: float, lat: float, gazetteer) -> tuple[str, float] | None:
     """Find nearest settlement in a provided gazetteer. Returns (name, distance_km).
 
     Supports both GeoDataFrame and list[(name, lon, lat)] fallback.
@@ -43,16 +105,12 @@ def nearest_from_gazetteer(lon: float, lat: float, gazetteer) -> Optional[Tuple[
     if _GEOS and gpd is not None and hasattr(gazetteer, "empty"):
         if gazetteer.empty:
             return None
-        pt = gpd.GeoSeries([Point(lon, lat)], crs="EPSG:4326")
-        pt_m = pt.to_crs(epsg=6933).iloc[0]
-        gaz_m = gazetteer.to_crs(epsg=6933)
-        sidx = gaz_m.sindex
-        cand_idx = list(sidx.nearest(pt_m.bounds, num_results=1))
-        if not cand_idx:
+        gaz_m, sidx = _gaz_in_metric(_ById(gazetteer))
+        x, y = project_xy(lon, lat, WGS84_EPSG, METRIC_EPSG)
+        idx, dist_m = sidx.nearest(Point(float(x), float(y)), return_all=False, return_distance=True)
+        if idx.shape[1] == 0:
             return None
-        cand = gaz_m.iloc[cand_idx[0]]
-        dist_km = float(cand.geometry.distance(pt_m)) / 1000.0
-        return str(cand["name"]), dist_km
+        return str(gaz_m["name"].iat[int(idx[1, 0])]), float(dist_m[0]) / 1000.0
     # fallback: brute-force in lat/lon using haversine approx
     import math
     best = None
@@ -68,7 +126,36 @@ def nearest_from_gazetteer(lon: float, lat: float, gazetteer) -> Optional[Tuple[
     return best
 
 
-def reverse_geocode_geopy(lon: float, lat: float, user_agent: str = "deepstate-reports") -> Optional[str]:
+def nearest_from_gazetteer_bulk(lons, lats, gazetteer) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized `nearest_from_gazetteer` for many points at once.
+
+    Returns (names, distances_km) arrays aligned with the input; entries without a match
+    are None / NaN. With a GeoDataFrame all points are projected in one call and resolved
+    in a single STRtree nearest query.
+    """
+    lons = np.asarray(lons, dtype=float)
+    lats = np.asarray(lats, dtype=float)
+    names = np.full(lons.shape, None, dtype=object)
+    dists = np.full(lons.shape, np.nan)
+    if gazetteer is None or lons.size == 0:
+        return names, dists
+    if _GEOS and gpd is not None and hasattr(gazetteer, "empty"):
+        if gazetteer.empty:
+            return names, dists
+        gaz_m, sidx = _gaz_in_metric(_ById(gazetteer))
+        xs, ys = project_xy(lons, lats, WGS84_EPSG, METRIC_EPSG)
+        idx, dist_m = sidx.nearest(shapely.points(xs, ys), return_all=False, return_distance=True)
+        names[idx[0]] = gaz_m["name"].astype(str).to_numpy()[idx[1]]
+        dists[idx[0]] = dist_m / 1000.0
+        return names, dists
+    for i, (lon, lat) in enumerate(zip(lons, lats, strict=True)):
+        res = nearest_from_gazetteer(float(lon), float(lat), gazetteer)
+        if res:
+            names[i], dists[i] = res
+    return names, dists
+
+
+def reverse_geocode_geopy(lon: float, lat: float, user_agent: str = "deepstate-reports") -> str | None:
     """Fallback reverse geocoding via geopy/Nominatim (if installed)."""
     if Nominatim is None:
         return None
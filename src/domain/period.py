@@ -1,17 +1,161 @@
 from __future__ import annotations
 
+import heapq
+import itertools
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-
-from src.db.dao import get_change_summary, list_cached_pairs, list_layer_dates, upsert_change_summary
+from functools import lru_cache
+
+from src.db.dao import (
+    list_cached_pairs,
+    list_change_summaries,
+    list_layer_dates,
+    upsert_change_summaries_bulk,
+)
+from src.domain.geo_changes import ChangeItem
 from src.domain.pipeline import CLASSES, compare_dates_db
-from collections import defaultdict
-
 from src.reporting.period_report import PeriodReport, build_period_report_text
-from src.reporting.report_generator import build_telegram_report
+
+_Pair = tuple[date, date]
+# (gained km², lost km², top items) for one (class, pair)
+_Summary = tuple[float, float, list[ChangeItem]]
 
 
+@lru_cache(maxsize=4096)
 def _to_key(d: date) -> str:
-    return d.strftime("%Y_%m_%d")
+    return f"{d.year:04d}_{d.month:02d}_{d.day:02d}"
+
+
+def _select_day_pairs(df: date, dt: date, *, use_cache: bool) -> list[_Pair]:
+    """Adjacent pairs of layer dates in [df, dt]; with the cache on and fewer than two
+    layers, the pairs already summarized in the cache."""
+
+    available = sorted(d for d in list_layer_dates() if df <= d <= dt)
+    if not use_cache or len(available) >= 2:
+        return list(zip(available, available[1:], strict=False))
+    return list_cached_pairs(date_from=df, date_to=dt)
+
+
+def _partition_cached(
+    day_pairs: list[_Pair],
+    clazzes: tuple[str, ...],
+    cache: dict[tuple[str, date, date], _Summary],
+) -> tuple[dict[_Pair, dict[str, _Summary]], dict[_Pair, tuple[str, ...]]]:
+    """Split each pair's classes into cached summaries and the classes still to compute."""
+
+    cached_by_pair: dict[_Pair, dict[str, _Summary]] = {}
+    missing_by_pair: dict[_Pair, tuple[str, ...]] = {}
+    for a, b in day_pairs:
+        cached_per_class = {c: cache[(c, a, b)] for c in clazzes if (c, a, b) in cache}
+        cached_by_pair[(a, b)] = cached_per_class
+        missing = tuple(c for c in clazzes if c not in cached_per_class)
+        if missing:
+            missing_by_pair[(a, b)] = missing
+    return cached_by_pair, missing_by_pair
+
+
+def _recompute_missing(
+    missing_by_pair: dict[_Pair, tuple[str, ...]],
+    *,
+    gazetteer_csv: str | None,
+    min_area_km2: float,
+    cluster_distance_km: float | None,
+) -> dict[_Pair, list[ChangeItem]]:
+    """Compare the missing classes of every pair; pairs run concurrently (GEOS releases the GIL)."""
+
+    if not missing_by_pair:
+        return {}
+
+    def _compute(pair: _Pair) -> list[ChangeItem]:
+        return compare_dates_db(
+            _to_key(pair[0]),
+            _to_key(pair[1]),
+            clazzes=missing_by_pair[pair],
+            gazetteer_csv=gazetteer_csv,
+            min_area_km2=min_area_km2,
+            cluster_distance_km=cluster_distance_km,
+        )
+
+    miss_pairs = list(missing_by_pair)
+    with ThreadPoolExecutor(max_workers=min(len(miss_pairs), os.cpu_count() or 1)) as pool:
+        return dict(zip(miss_pairs, pool.map(_compute, miss_pairs), strict=True))
+
+
+def _aggregate_day(
+    pair: _Pair,
+    clazzes: tuple[str, ...],
+    cached_per_class: dict[str, _Summary],
+    fresh: list[ChangeItem] | None,
+    *,
+    top_n: int,
+) -> tuple[list[ChangeItem], dict[str, tuple[float, float]], list[dict]]:
+    """Merge one pair's cached and recomputed classes.
+
+    Returns the day's items, (gained, lost) per class and the cache rows for the recomputed
+    classes. `fresh` is None when every class came from the cache.
+    """
+
+    # Aggregate recomputed items per class in a single pass.
+    buckets: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    per_class: dict[str, list[ChangeItem]] = defaultdict(list)
+    for it in fresh or ():
+        buckets[it.direction][it.status] += it.area_km2
+        per_class[it.direction].append(it)
+
+    # Totals per class; cached classes contribute their stored top patches to the day list.
+    totals: dict[str, tuple[float, float]] = {}
+    rows: list[dict] = []
+    day_top: list[ChangeItem] = []
+    for clazz in clazzes:
+        if clazz in cached_per_class:
+            gained, lost, top_sub = cached_per_class[clazz]
+            day_top.extend(top_sub)
+        else:
+            gained = buckets[clazz]["gained"]
+            lost = buckets[clazz]["lost"]
+            top_sub = heapq.nlargest(top_n, per_class.get(clazz, []), key=lambda x: x.area_km2)
+            rows.append(
+                {
+                    "clazz": clazz,
+                    "date_prev": pair[0],
+                    "date_curr": pair[1],
+                    "gained_km2": gained,
+                    "lost_km2": lost,
+                    "top_items": top_sub,
+                }
+            )
+        totals[clazz] = (gained, lost)
+
+    if fresh is None:
+        day_items = heapq.nlargest(top_n, day_top, key=lambda x: x.area_km2)
+    elif day_top:
+        day_items = sorted(fresh + day_top, key=lambda x: x.area_km2, reverse=True)
+    else:
+        day_items = fresh
+    return day_items, totals, rows
+
+
+def _offer_top(
+    heap: list[tuple[float, int, ChangeItem]],
+    seq: itertools.count[int],
+    items: list[ChangeItem],
+    top_n: int,
+) -> None:
+    """Keep the `top_n` largest items in `heap`, a min-heap of (area, -seq, item).
+
+    The negated sequence number makes earlier items win ties.
+    """
+
+    if top_n <= 0:
+        return
+    for it in items:
+        area = it.area_km2
+        if len(heap) < top_n:
+            heapq.heappush(heap, (area, -next(seq), it))
+        elif area > heap[0][0]:
+            heapq.heapreplace(heap, (area, -next(seq), it))
 
 
 def generate_period_report_db(
@@ -39,78 +183,44 @@ def generate_period_report_db(
     if dt < df:
         df, dt = dt, df
 
-    available = [d for d in list_layer_dates() if df <= d <= dt]
-    available.sort()
-
-    # Determine which day-pairs to report on.
-    # If cache-only mode: use cached pairs.
-    # Else: prefer layers-based adjacency, fallback to cached pairs.
-    if not use_cache:
-        day_pairs = list(zip(available, available[1:], strict=False))
-    else:
-        if len(available) >= 2:
-            day_pairs = list(zip(available, available[1:], strict=False))
-        else:
-            day_pairs = list_cached_pairs(date_from=df, date_to=dt)
-
-    day_reports: list[tuple[str, str, str]] = []
+    day_pairs = _select_day_pairs(df, dt, use_cache=use_cache)
+
+    # Probe the summary cache for every (class, pair) with a single query; only the classes
+    # missing from it are recomputed.
+    cache = {}
+    if use_cache and not force_recompute:
+        cache = list_change_summaries((clazz, a, b) for a, b in day_pairs for clazz in clazzes)
+    cached_by_pair, missing_by_pair = _partition_cached(day_pairs, clazzes, cache)
+    computed = _recompute_missing(
+        missing_by_pair,
+        gazetteer_csv=gazetteer_csv,
+        min_area_km2=min_area_km2,
+        cluster_distance_km=cluster_distance_km,
+    )
 
+    day_reports: list[tuple[str, str, list[ChangeItem]]] = []
     summary_by_dir: dict[str, dict[str, float]] = defaultdict(lambda: {"gained": 0.0, "lost": 0.0})
-    top_candidates: list = []
+    # Period top-N as a min-heap of (area, -seq, item); its root is the entry threshold.
+    top_heap: list[tuple[float, int, ChangeItem]] = []
+    seq = itertools.count()
+    # Cache rows for recomputed (class, pair) entries, written in one transaction after the loop.
+    pending_upserts: list[dict] = []
 
     for a, b in day_pairs:
-        akey, bkey = _to_key(a), _to_key(b)
-
-        # Try to use cached summaries per class; if any class is missing, recompute.
-        cached_per_class: dict[str, tuple[float, float, list]] = {}
-        if use_cache and not force_recompute:
-            for clazz in clazzes:
-                cached = get_change_summary(clazz=clazz, date_prev=a, date_curr=b)
-                if cached is None:
-                    cached_per_class = {}
-                    break
-                cached_per_class[clazz] = cached
-
-        if cached_per_class:
-            # Build daily top list from cached top patches; totals from cached gained/lost.
-            day_top: list = []
-            for clazz, (gained, lost, top_items) in cached_per_class.items():
-                summary_by_dir[clazz]["gained"] += float(gained)
-                summary_by_dir[clazz]["lost"] += float(lost)
-                day_top.extend(top_items)
-            day_items = sorted(day_top, key=lambda x: x["area_km2"], reverse=True)[:top_n]
-            top_candidates.extend(day_items)
-        else:
-            # Compute full diff from layers.
-            day_items = compare_dates_db(
-                akey,
-                bkey,
-                clazzes=clazzes,
-                gazetteer_csv=gazetteer_csv,
-                min_area_km2=min_area_km2,
-                cluster_distance_km=cluster_distance_km,
-            )
-            # Aggregate totals and cache per class.
-            for clazz in clazzes:
-                sub = [it for it in day_items if it.get("direction") == clazz]
-                gained = sum(it["area_km2"] for it in sub if it["status"] == "gained")
-                lost = sum(it["area_km2"] for it in sub if it["status"] == "lost")
-                summary_by_dir[clazz]["gained"] += float(gained)
-                summary_by_dir[clazz]["lost"] += float(lost)
-                top_sub = sorted(sub, key=lambda x: x["area_km2"], reverse=True)[:top_n]
-                upsert_change_summary(
-                    clazz=clazz,
-                    date_prev=a,
-                    date_curr=b,
-                    gained_km2=float(gained),
-                    lost_km2=float(lost),
-                    top_items=top_sub,
-                )
-            top_candidates.extend(sorted(day_items, key=lambda x: x["area_km2"], reverse=True)[:top_n])
-
-        day_reports.append((akey, bkey, build_telegram_report(day_items)))
-
-    top_items = sorted(top_candidates, key=lambda x: x["area_km2"], reverse=True)[:top_n]
+        fresh = computed.get((a, b), []) if (a, b) in missing_by_pair else None
+        day_items, totals, rows = _aggregate_day(
+            (a, b), clazzes, cached_by_pair[(a, b)], fresh, top_n=top_n
+        )
+        for clazz, (gained, lost) in totals.items():
+            summary_by_dir[clazz]["gained"] += gained
+            summary_by_dir[clazz]["lost"] += lost
+        pending_upserts.extend(rows)
+        _offer_top(top_heap, seq, day_items, top_n)
+        day_reports.append((_to_key(a), _to_key(b), day_items))
+
+    upsert_change_summaries_bulk(pending_upserts)
+
+    top_items = [it for _, _, it in sorted(top_heap, key=lambda e: (e[0], e[1]), reverse=True)]
 
     return PeriodReport(
         date_from=_to_key(df),
@@ -16,16 +16,17 @@ def compute_and_store_latest(data_root: str, *, gazetteer_csv: Optional[str] = N
     Returns report text.
     """
     # First, compute items and track picked files
-    from src.domain.pipeline import _find_layer_files  # reuse internal helper
+    from src.domain.pipeline import _scan_layer_files  # reuse internal helper
 
+    layer_files = _scan_layer_files(data_root, CLASSES)
     picked: dict[str, tuple[Path, Path]] = {}
     for clazz in CLASSES:
-        files = _find_layer_files(data_root, clazz)
+        files = layer_files[clazz]
         if len(files) >= 2:
             picked[clazz] = (files[-2], files[-1])
 
-    # compute combined items using pipeline.compare_latest
-    items = compare_latest(data_root, gazetteer_csv=gazetteer_csv)
+    # compute combined items using pipeline.compare_latest (same scan, no second walk)
+    items = compare_latest(data_root, gazetteer_csv=gazetteer_csv, layer_files=layer_files)
 
     # persist changes per class with parsed dates
     if picked:
@@ -37,7 +38,7 @@ def compute_and_store_latest(data_root: str, *, gazetteer_csv: Optional[str] = N
         # insert changes per class
         for clazz, (prev_p, curr_p) in picked.items():
             # filter items by direction
-            sub = [it for it in items if it.get("direction") == clazz]
+            sub = [it for it in items if it.direction == clazz]
             if sub:
                 insert_changes(clazz=clazz, date_prev=d_prev, date_curr=d_curr, items=sub)
         # store report
@@ -1,60 +1,149 @@
 from __future__ import annotations
 
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 
-from src.db.dao import get_layer_geojson_text
+from src.db.dao import get_layer_checksums, get_layer_geom_source
 from src.domain.geo_changes import ChangeItem, compute_changes
-from src.domain.nearest import load_gazetteer_csv, nearest_from_gazetteer, reverse_geocode_geopy
+from src.domain.nearest import (
+    gazetteer_version,
+    load_gazetteer_csv,
+    load_gazetteer_version,
+    nearest_from_gazetteer_bulk,
+    reverse_geocode_geopy,
+)
 
 CLASSES = ("occupied", "gray")
 
+_LAYER_FILE_RE = re.compile(r"layer_(\w+?)_\d{4}_\d{2}_\d{2}\.geojson")
 
-def _find_layer_files(root: str, clazz: str) -> list[Path]:
-    root_p = Path(root)
-    pattern = re.compile(rf"layer_{re.escape(clazz)}_\d{{4}}_\d{{2}}_\d{{2}}\.geojson$")
-    files = [p for p in root_p.rglob("*.geojson") if pattern.search(p.name)]
-    return sorted(files)
 
+def _scan_layer_files(root: str, clazzes: tuple[str, ...] = CLASSES) -> dict[str, list[Path]]:
+    """Find layer_<class>_YYYY_MM_DD.geojson files for all classes in one directory walk.
 
-def compare_latest(data_root: str, *, gazetteer_csv: str | None = None) -> list[ChangeItem]:
+    The whole file name must match (no prefixed copies such as old_layer_...); symlinked
+    directories are not descended into, as with `Path.rglob`. Lists are sorted by path.
+    """
+    found: dict[str, list[Path]] = {c: [] for c in clazzes}
+    pending = [root]
+    while pending:
+        try:
+            it = os.scandir(pending.pop())
+        except OSError:  # missing or unreadable directory
+            continue
+        with it:
+            for entry in it:
+                # DirEntry caches the type from the directory read: no stat() or Path per entry
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                    continue
+                m = _LAYER_FILE_RE.fullmatch(entry.name)
+                if m and m.group(1) in found:
+                    found[m.group(1)].append(Path(entry.path))
+    for files in found.values():
+        files.sort()
+    return found
+
+
+def _enrich_items(items: list[ChangeItem], clazz: str, gaz_gdf) -> list[ChangeItem]:
+    """Return items with direction and settlement set via gazetteer (one batched lookup) or reverse geocoding."""
+    names = dists = None
+    if gaz_gdf is not None and items:
+        lons, lats = zip(*(it.centroid for it in items), strict=True)
+        names, dists = nearest_from_gazetteer_bulk(lons, lats, gaz_gdf)
+    out: list[ChangeItem] = []
+    for i, it in enumerate(items):
+        name = None
+        dist = it.settlement_distance_km
+        if names is not None and names[i]:
+            name = str(names[i])
+            dist = float(dists[i])
+        if not name:
+            lon, lat = it.centroid
+            name = reverse_geocode_geopy(lon, lat) or ""
+        out.append(it._replace(direction=clazz, settlement=name, settlement_distance_km=dist))
+    return out
+
+
+def compare_latest(
+    data_root: str,
+    *,
+    gazetteer_csv: str | None = None,
+    layer_files: dict[str, list[Path]] | None = None,
+) -> list[ChangeItem]:
     """Compare the two latest dates per class (occupied/gray) and return merged changes.
 
     - Looks for files named layer_<class>_YYYY_MM_DD.geojson under data_root/ (any subfolders)
     - For each class, takes the two most recent files and computes changes
     - Optionally enriches with nearest settlement from a CSV gazetteer; otherwise tries reverse geocoding
+
+    `layer_files` may pass in an existing `_scan_layer_files` result to skip the directory walk.
     """
     all_items: list[ChangeItem] = []
     gaz_gdf = load_gazetteer_csv(gazetteer_csv) if gazetteer_csv else None
+    if layer_files is None:
+        layer_files = _scan_layer_files(data_root)
 
     selected: dict[str, tuple[Path, Path]] = {}
     for clazz in CLASSES:
-        files = _find_layer_files(data_root, clazz)
+        files = layer_files.get(clazz, [])
         if len(files) < 2:
             continue
         prev, curr = files[-2], files[-1]
         selected[clazz] = (prev, curr)
         items = compute_changes(str(prev), str(curr))
-        # enrich items: set status already contains gained/lost; fill settlement via gazetteer or reverse geocoding
-        for it in items:
-            lon, lat = it["centroid"]
-            name = None
-            if gaz_gdf is not None:
-                res = nearest_from_gazetteer(lon, lat, gaz_gdf)
-                if res:
-                    name = res[0]
-                    it["settlement_distance_km"] = float(res[1])
-            if not name:
-                name = reverse_geocode_geopy(lon, lat) or ""
-            it["settlement"] = name
-            it["direction"] = clazz
+        items = _enrich_items(items, clazz, gaz_gdf)
         all_items.extend(items)
 
     # sort aggregated by area desc
-    all_items.sort(key=lambda x: x["area_km2"], reverse=True)
+    all_items.sort(key=lambda x: x.area_km2, reverse=True)
     return all_items
 
 
+def _compare_class_db(
+    clazz: str,
+    d1,
+    d2,
+    gaz_gdf,
+    min_area_km2: float,
+    cluster_distance_km: float | None,
+) -> list[ChangeItem]:
+    t1 = get_layer_geom_source(clazz=clazz, d=d1)
+    t2 = get_layer_geom_source(clazz=clazz, d=d2)
+    if not t1 or not t2:
+        return []
+    items = compute_changes(
+        t1,
+        t2,
+        min_area_km2=min_area_km2,
+        cluster_distance_km=cluster_distance_km,
+    )
+    return _enrich_items(items, clazz, gaz_gdf)
+
+
+@lru_cache(maxsize=256)
+def _compare_class_db_cached(
+    clazz: str,
+    d1,
+    d2,
+    checksum1: str,
+    checksum2: str,
+    gaz_version: tuple[str, int, int] | None,
+    min_area_km2: float,
+    cluster_distance_km: float | None,
+) -> tuple[ChangeItem, ...]:
+    """Memoized `_compare_class_db`; the layer checksums make stale hits impossible.
+
+    The gazetteer is keyed by its file version, so an edited CSV is a different key; the
+    frame itself comes from the loader cache and is not held by this memo.
+    """
+
+    gaz_gdf = load_gazetteer_version(gaz_version) if gaz_version is not None else None
+    return tuple(_compare_class_db(clazz, d1, d2, gaz_gdf, min_area_km2, cluster_distance_km))
+
+
 def compare_dates_db(
     date1: str,
     date2: str,
@@ -74,34 +163,22 @@ def compare_dates_db(
     d2 = _dt.strptime(date2, "%Y_%m_%d").date()
 
     all_items: list[ChangeItem] = []
-    gaz_gdf = load_gazetteer_csv(gazetteer_csv) if gazetteer_csv else None
+    checksums = get_layer_checksums(clazzes=clazzes, dates=(d1, d2))
+    gaz_version = gazetteer_version(gazetteer_csv) if gazetteer_csv else None
+    gaz_gdf = load_gazetteer_version(gaz_version) if gaz_version is not None else None
 
     for clazz in clazzes:
-        t1 = get_layer_geojson_text(clazz=clazz, d=d1)
-        t2 = get_layer_geojson_text(clazz=clazz, d=d2)
-        if not t1 or not t2:
-            continue
-        items = compute_changes(
-            t1,
-            t2,
-            min_area_km2=min_area_km2,
-            cluster_distance_km=cluster_distance_km,
-        )
-        for it in items:
-            lon, lat = it["centroid"]
-            name = None
-            if gaz_gdf is not None:
-                res = nearest_from_gazetteer(lon, lat, gaz_gdf)
-                if res:
-                    name = res[0]
-                    it["settlement_distance_km"] = float(res[1])
-            if not name:
-                name = reverse_geocode_geopy(lon, lat) or ""
-            it["settlement"] = name
-            it["direction"] = clazz
+        cs1, cs2 = checksums.get((clazz, d1)), checksums.get((clazz, d2))
+        if cs1 is not None and cs2 is not None:
+            # Both layers are content-addressed, so the result can be memoized.
+            items = _compare_class_db_cached(
+                clazz, d1, d2, cs1, cs2, gaz_version, min_area_km2, cluster_distance_km
+            )
+        else:
+            items = _compare_class_db(clazz, d1, d2, gaz_gdf, min_area_km2, cluster_distance_km)
         all_items.extend(items)
 
-    all_items.sort(key=lambda x: x["area_km2"], reverse=True)
+    all_items.sort(key=lambda x: x.area_km2, reverse=True)
     return all_items
 
 
@@ -121,19 +198,8 @@ def compare_dates(data_root: str, date1: str, date2: str, *, clazzes: tuple[str,
             # пропустить, если файлов нет
             continue
         items = compute_changes(str(p1), str(p2))
-        for it in items:
-            lon, lat = it["centroid"]
-            name = None
-            if gaz_gdf is not None:
-                res = nearest_from_gazetteer(lon, lat, gaz_gdf)
-                if res:
-                    name = res[0]
-                    it["settlement_distance_km"] = float(res[1])
-            if not name:
-                name = reverse_geocode_geopy(lon, lat) or ""
-            it["settlement"] = name
-            it["direction"] = clazz
+        items = _enrich_items(items, clazz, gaz_gdf)
         all_items.extend(items)
 
-    all_items.sort(key=lambda x: x["area_km2"], reverse=True)
+    all_items.sort(key=lambda x: x.area_km2, reverse=True)
     return all_items
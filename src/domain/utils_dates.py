@@ -9,5 +9,4 @@ def date_from_filename(p: Path) -> date:
     m = _DATE_RE.search(p.name)
     if not m:
         raise ValueError(f"Cannot parse date from {p}")
-    y, mth, d = map(int, m.groups())
-    return date(y, mth, d)
+    return date.fromisoformat(f"{m.group(1)}-{m.group(2)}-{m.group(3)}")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import asyncio
+from functools import lru_cache
 from typing import Iterable, Optional, Sequence
 
 from src.core.config import settings
@@ -12,9 +13,10 @@ except Exception:  # pragma: no cover - optional at runtime
     Bot = None  # type: ignore
 
 
-def _parse_admin_ids(raw: str | None) -> list[int]:
+@lru_cache(maxsize=1)
+def _parse_admin_ids(raw: str | None) -> tuple[int, ...]:
     if not raw:
-        return []
+        return ()
     out: list[int] = []
     for part in raw.split(','):
         part = part.strip()
@@ -24,7 +26,7 @@ def _parse_admin_ids(raw: str | None) -> list[int]:
             out.append(int(part))
         except ValueError:
             continue
-    return out
+    return tuple(out)
 
 
 async def send_report_via_bot(text: str, chat_ids: Sequence[int]) -> None:
@@ -33,16 +35,6 @@ async def send_report_via_bot(text: str, chat_ids: Sequence[int]) -> None:
     # Telegram integration disabled: no bot token is configured in settings.
     if Bot is None:
         return
-    return
-    try:
-        for chat_id in chat_ids:
-            try:
-                await bot.send_message(chat_id=chat_id, text=text)
-            except Exception:
-                # continue sending to others even if one fails
-                continue
-    finally:
-        await bot.session.close()  # type: ignore[func-returns-value]
 
 
 async def generate_and_send_report(
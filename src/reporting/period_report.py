@@ -1,17 +1,20 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
+from collections import Counter
 from collections.abc import Iterable
 from dataclasses import dataclass
 
 from src.domain.geo_changes import ChangeItem
+from src.reporting.report_generator import build_telegram_report
 
 
 @dataclass(frozen=True)
 class PeriodReport:
     date_from: str
     date_to: str
-    day_reports: list[tuple[str, str, str]]
+    # (from, to, day items); daily text is rendered only when the report is built
+    day_reports: list[tuple[str, str, list[ChangeItem]]]
     # summary_by_dir[direction][status] -> area
     summary_by_dir: dict[str, dict[str, float]]
     top_items: list[ChangeItem]
@@ -35,17 +38,16 @@ def build_period_report_text(rep: PeriodReport) -> str:
     # Daily
     if rep.day_reports:
         lines.append("\nДень-за-днём:")
-        for d1, d2, text in rep.day_reports:
-            lines.append(f"\n---\n{d1} → {d2}\n{text}")
+        for d1, d2, items in rep.day_reports:
+            lines.append(f"\n---\n{d1} → {d2}\n{build_telegram_report(items)}")
 
     # Top
     if rep.top_items:
         lines.append("\nТОП изменений за период:")
         for it in rep.top_items:
-            place = it.get("settlement") or "н/п?"
-            dir_txt = it.get("direction") or ""
+            place = it.settlement or "н/п?"
             lines.append(
-                f"- {place} ({dir_txt}): {it['status']} {it['area_km2']:.2f} км²"
+                f"- {place} ({it.direction}): {it.status} {it.area_km2:.2f} км²"
             )
 
     return "\n".join(lines)
@@ -53,14 +55,25 @@ def build_period_report_text(rep: PeriodReport) -> str:
 
 def aggregate_period(items_by_day: Iterable[list[ChangeItem]], *, top_n: int = 10) -> tuple[dict[str, dict[str, float]], list[ChangeItem]]:
     """Aggregate period totals and pick top-N items across all days."""
-    summary: dict[str, dict[str, float]] = defaultdict(lambda: {"gained": 0.0, "lost": 0.0})
-    all_items: list[ChangeItem] = []
+    totals: Counter[tuple[str, str]] = Counter()
+    # N-sized min-heap of (area, -seq, item) instead of collecting every item of the period;
+    # the negated sequence keeps the earliest item on ties, as nlargest does
+    heap: list[tuple[float, int, ChangeItem]] = []
+    seq = 0
     for items in items_by_day:
         for it in items:
-            d = it.get("direction") or "misc"
-            if it["status"] in ("gained", "lost"):
-                summary[d][it["status"]] = summary[d].get(it["status"], 0.0) + float(it["area_km2"])
-            all_items.append(it)
+            area = it.area_km2
+            if it.status in ("gained", "lost"):
+                totals[(it.direction or "misc", it.status)] += area
+            seq -= 1
+            if len(heap) < top_n:
+                heapq.heappush(heap, (area, seq, it))
+            elif top_n > 0:
+                heapq.heappushpop(heap, (area, seq, it))
 
-    top = sorted(all_items, key=lambda x: x["area_km2"], reverse=True)[:top_n]
-    return dict(summary), top
+    summary: dict[str, dict[str, float]] = {}
+    for (d, status), area in totals.items():
+        summary.setdefault(d, {"gained": 0.0, "lost": 0.0})[status] = area
+
+    top = [it for _, _, it in sorted(heap, key=lambda e: (e[0], e[1]), reverse=True)]
+    return summary, top
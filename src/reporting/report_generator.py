@@ -1,6 +1,8 @@
 """Report generation from change items (skeleton)."""
 
 from __future__ import annotations
+
+import heapq
 from typing import Iterable
 from src.domain.geo_changes import ChangeItem
 
@@ -13,70 +15,78 @@ def build_telegram_report(items: Iterable[ChangeItem]) -> str:
     - Group by direction (occupied/gray) and summarize counts/areas
     - Highlight TOP-3 changes by area with settlement names (if present)
     """
-    items = list(items)
-    if not items:
-        return "⚪️ На линии фронта без существенных изменений в конфигурации зон"
-
-    # Top-3 by area (grouped by settlement if possible)
-    top3_raw = sorted(items, key=lambda x: x["area_km2"], reverse=True)
-
-    from collections import OrderedDict
-
-    grouped: "OrderedDict[tuple[str, str], ChangeItem]" = OrderedDict()
-    for it in top3_raw:
-        key = (it.get("settlement") or "", it.get("direction") or "")
-        if key not in grouped:
-            grouped[key] = dict(it)
-            continue
-        # aggregate area within group
-        grouped[key]["area_km2"] = float(grouped[key]["area_km2"]) + float(it["area_km2"])  # type: ignore[index]
-        # keep the closest distance if present
-        d0 = grouped[key].get("settlement_distance_km")
-        d1 = it.get("settlement_distance_km")
-        if d1 is not None:
-            grouped[key]["settlement_distance_km"] = float(d1) if d0 is None else min(float(d0), float(d1))
-
-    top3 = list(grouped.values())[:3]
 
     def fmt_item(it: ChangeItem) -> str:
-        area = f"{it['area_km2']:.2f} км²"
-        place = it.get("settlement") or "неизвестный н.п."
-        dist = it.get("settlement_distance_km")
+        area = f"{it.area_km2:.2f} км²"
+        place = it.settlement or "неизвестный н.п."
+        dist = it.settlement_distance_km
         if dist is not None:
-            place = f"{place} (~{float(dist):.1f} км)"
-        emoji = "🔴" if it["status"] == "gained" else "🟢" if it["status"] == "lost" else "⚪️"
-        dir_txt = it.get("direction") or ""
-        dir_pref = f" ({dir_txt})" if dir_txt else ""
-        return f"{emoji} {place}{dir_pref}: {it['status']} (+{area} изменения)"
+            place = f"{place} (~{dist:.1f} км)"
+        emoji = "🔴" if it.status == "gained" else "🟢" if it.status == "lost" else "⚪️"
+        dir_pref = f" ({it.direction})" if it.direction else ""
+        return f"{emoji} {place}{dir_pref}: {it.status} (+{area} изменения)"
 
     lines = ["📊 Суточные изменения на карте:"]
 
-    # Summary by direction
-    from collections import defaultdict
-
-    by_dir: dict[str, dict[str, float]] = defaultdict(lambda: {"gained": 0.0, "lost": 0.0})
-    by_settlement: dict[str, dict[str, float]] = defaultdict(lambda: {"gained": 0.0, "lost": 0.0})
-
-    for it in items:
-        d = it.get("direction") or "misc"
-        by_dir[d][it["status"]] = by_dir[d].get(it["status"], 0.0) + float(it["area_km2"])
+    # One pass over `items` (any iterable, consumed once) builds the groups and both summaries.
+    from collections import Counter
+
+    by_dir: Counter[tuple[str, str]] = Counter()
+    by_settlement: Counter[tuple[str, str]] = Counter()
+    # group (settlement, direction) -> [total area, closest distance, largest area, largest item,
+    # input index of the largest item]; the largest item supplies status/names
+    grouped: dict[tuple[str, str], list] = {}
+
+    for i, it in enumerate(items):
+        settlement = it.settlement or ""
+        direction = it.direction or ""
+        status = it.status
+        area = it.area_km2
+
+        by_dir[(direction or "misc", status)] += area
+        if settlement:
+            by_settlement[(settlement, status)] += area
+
+        key = (settlement, direction)
+        rec = grouped.get(key)
+        dist = it.settlement_distance_km
+        if rec is None:
+            grouped[key] = [area, dist, area, it, i]
+            continue
+        rec[0] += area
+        # keep the closest distance if present
+        if dist is not None:
+            rec[1] = dist if rec[1] is None else min(rec[1], dist)
+        if area > rec[2]:  # strict: on ties the earlier item stays the lead
+            rec[2] = area
+            rec[3] = it
+            rec[4] = i
+
+    # every item lands in a group, so no groups means no items
+    if not grouped:
+        return "⚪️ На линии фронта без существенных изменений в конфигурации зон"
 
-        s = it.get("settlement") or ""
-        if s:
-            by_settlement[s][it["status"]] = by_settlement[s].get(it["status"], 0.0) + float(it["area_km2"])
+    # Top-3 groups, ranked by their largest patch; equal areas keep input order, as a stable
+    # sort of the items would. Only these groups are materialized as items.
+    top3 = [
+        lead._replace(area_km2=total, settlement_distance_km=dist)
+        for total, dist, _, lead, _ in heapq.nlargest(3, grouped.values(), key=lambda r: (r[2], -r[4]))
+    ]
 
-    for d, agg in by_dir.items():
-        lines.append(f"• {d}: +{agg.get('gained', 0.0):.2f} км², -{agg.get('lost', 0.0):.2f} км²")
+    for d in dict.fromkeys(d for d, _ in by_dir):
+        lines.append(f"• {d}: +{by_dir[(d, 'gained')]:.2f} км², -{by_dir[(d, 'lost')]:.2f} км²")
 
     # Top settlements by total change
     if by_settlement:
-        def _total(v: dict[str, float]) -> float:
-            return float(v.get('gained', 0.0)) + float(v.get('lost', 0.0))
+        totals: Counter[str] = Counter()
+        for (name, status), area in by_settlement.items():
+            totals[name] += area if status in ("gained", "lost") else 0.0
 
-        top_places = sorted(by_settlement.items(), key=lambda kv: _total(kv[1]), reverse=True)[:5]
+        top_places = sorted(totals, key=totals.__getitem__, reverse=True)[:5]
         lines.append("\nТоп населённых пунктов по суммарным изменениям:")
-        for name, agg in top_places:
-            lines.append(f"• {name}: +{agg.get('gained', 0.0):.2f} км², -{agg.get('lost', 0.0):.2f} км²")
+        for name in top_places:
+            gained, lost = by_settlement[(name, "gained")], by_settlement[(name, "lost")]
+            lines.append(f"• {name}: +{gained:.2f} км², -{lost:.2f} км²")
 
     lines.append("")
     lines.append("ТОП-3 участков по площади:")
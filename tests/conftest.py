@@ -1,8 +1,101 @@
 # Ensure the 'src' directory is importable as a top-level package for tests
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 # Ensure project root is on sys.path so 'src' package is importable
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Named shared-cache DB: every engine opened on this URL in the process sees the same
+# data for as long as the session engine holds its connection.
+MEMORY_DB_URL = "sqlite+pysqlite:///file:svo_test?mode=memory&cache=shared&uri=true"
+
+
+def _clear_tables(engine) -> None:
+    """Delete every row, children first, keeping the schema."""
+    from src.db.base import Base
+
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+@pytest.fixture(scope="session")
+def _memory_engine():
+    """Session-wide in-memory SQLite engine; the schema is created once."""
+    from src.db.base import Base, get_engine
+
+    engine = get_engine(url=MEMORY_DB_URL)
+    Base.metadata.create_all(engine)
+    # DAO calls resolve the URL from the environment and get the same cached engine.
+    mp = pytest.MonkeyPatch()
+    mp.setenv("DATABASE_URL", MEMORY_DB_URL)
+    yield engine
+    mp.undo()
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def clear_db():
+    """Row cleanup for fixtures with a wider scope than `db_engine`."""
+    return _clear_tables
+
+
+@pytest.fixture
+def db_engine(_memory_engine):
+    """Shared in-memory DB for one test; all rows are deleted afterwards.
+
+    The DAO opens and commits its own sessions, so isolation is by cleanup rather than
+    by rolling back an outer transaction.
+    """
+    from src.db.base import get_engine
+
+    # may be a fresh engine if a test cleared the engine cache; it opens the same named DB
+    engine = get_engine()
+    yield engine
+    _clear_tables(engine)
+
+
+@pytest.fixture(scope="session")
+def render_report():
+    """`build_telegram_report` memoized on its items (ChangeItems are hashable tuples).
+
+    Report tests that render the same payload share one rendering per session.
+    """
+    from src.reporting.report_generator import build_telegram_report
+
+    @lru_cache(maxsize=128)
+    def _render(items: tuple) -> str:
+        return build_telegram_report(items)
+
+    return lambda items: _render(tuple(items))
+
+
+@pytest.fixture(scope="module")
+def report_items_top3():
+    """Four changes across two directions; TownC and TownA are the largest."""
+    from src.domain.geo_changes import ChangeItem
+
+    # a tuple of NamedTuples: nothing a test can mutate and leak into the next one
+    return (
+        ChangeItem(direction="occupied", settlement="TownA", status="gained", area_km2=1.2, centroid=(0, 0)),
+        ChangeItem(direction="gray", settlement="TownB", status="lost", area_km2=0.7, centroid=(0, 0)),
+        ChangeItem(direction="occupied", settlement="TownC", status="gained", area_km2=2.1, centroid=(0, 0)),
+        ChangeItem(direction="gray", settlement="TownD", status="lost", area_km2=0.2, centroid=(0, 0)),
+    )
+
+
+@pytest.fixture(scope="module")
+def report_items_grouped():
+    """Two changes near settlement A (0.8 and 1.2 km away) and one near B."""
+    from src.domain.geo_changes import ChangeItem
+
+    return (
+        ChangeItem(direction="occupied", settlement="A", settlement_distance_km=1.2, status="gained", area_km2=1.0, centroid=(0.0, 0.0)),
+        ChangeItem(direction="occupied", settlement="A", settlement_distance_km=0.8, status="gained", area_km2=0.5, centroid=(0.1, 0.0)),
+        ChangeItem(direction="occupied", settlement="B", status="lost", area_km2=2.0, centroid=(1.0, 1.0)),
+    )
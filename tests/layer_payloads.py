@@ -0,0 +1,12 @@
+"""GeoJSON layer payloads shared by the DB tests."""
+
+# A FeatureCollection holding one axis-aligned square, serialized by plain formatting.
+_TEMPLATE = (
+    '{{"type":"FeatureCollection","features":[{{"type":"Feature","geometry":{{"type":"Polygon",'
+    '"coordinates":[[[{x0},{y0}],[{x1},{y0}],[{x1},{y1}],[{x0},{y1}],[{x0},{y0}]]]}},"properties":{{}}}}]}}'
+)
+
+
+def fc_square(lon: float, lat: float, size: float = 1.0) -> str:
+    """FeatureCollection text with one `size`-degree square whose south-west corner is (lon, lat)."""
+    return _TEMPLATE.format(x0=lon, y0=lat, x1=lon + size, y1=lat + size)
@@ -3,9 +3,9 @@ from __future__ import annotations
 import json
 from datetime import date
 
-from src.db import dao
-from src.db.base import Base, clear_engine_cache, get_engine
-from src.domain.pipeline import compare_dates_db
+import pytest
+
+pytestmark = pytest.mark.xdist_group(name="db")
 
 
 def _square(lon: float, lat: float, size: float = 1.0) -> dict:
@@ -30,13 +30,9 @@ def _fc(geom: dict) -> dict:
     }
 
 
-def test_compare_dates_db_sqlite(tmp_path, monkeypatch):
-    db_path = tmp_path / "t.db"
-    monkeypatch.setenv("DATABASE_URL", f"sqlite+pysqlite:///{db_path}")
-    clear_engine_cache()
-
-    engine = get_engine()
-    Base.metadata.create_all(engine)
+def test_compare_dates_db_sqlite(db_engine):
+    from src.db import dao
+    from src.domain.pipeline import compare_dates_db
 
     d1 = date(2024, 1, 1)
     d2 = date(2024, 1, 2)
@@ -49,5 +45,64 @@ def test_compare_dates_db_sqlite(tmp_path, monkeypatch):
 
     items = compare_dates_db("2024_01_01", "2024_01_02", clazzes=("occupied",), min_area_km2=0.0)
     assert items
-    assert {it["status"] for it in items} == {"gained", "lost"}
-    assert all(it["direction"] == "occupied" for it in items)
+    assert {it.status for it in items} == {"gained", "lost"}
+    assert all(it.direction == "occupied" for it in items)
+
+
+def test_compare_dates_db_memoizes_unchanged_layers(db_engine):
+    from src.db import dao
+    from src.domain.pipeline import _compare_class_db_cached, compare_dates_db
+
+    _compare_class_db_cached.cache_clear()
+
+    dao.upsert_layer(clazz="occupied", d=date(2024, 1, 1), geojson_text=json.dumps(_fc(_square(0, 0, 1.0))))
+    dao.upsert_layer(clazz="occupied", d=date(2024, 1, 2), geojson_text=json.dumps(_fc(_square(0.5, 0, 1.0))))
+
+    first = compare_dates_db("2024_01_01", "2024_01_02", clazzes=("occupied",), min_area_km2=0.0)
+    expected = list(first)
+    first.clear()  # callers own the returned list
+    second = compare_dates_db("2024_01_01", "2024_01_02", clazzes=("occupied",), min_area_km2=0.0)
+    assert _compare_class_db_cached.cache_info().hits == 1
+    assert second == expected
+
+    # a changed layer has a new checksum and is recomputed
+    dao.upsert_layer(clazz="occupied", d=date(2024, 1, 2), geojson_text=json.dumps(_fc(_square(0.2, 0, 1.0))))
+    third = compare_dates_db("2024_01_01", "2024_01_02", clazzes=("occupied",), min_area_km2=0.0)
+    assert _compare_class_db_cached.cache_info().misses == 2
+    assert sum(it.area_km2 for it in third) < sum(it.area_km2 for it in second)
+
+
+def test_compare_dates_db_loads_gazetteer_once(db_engine, tmp_path):
+    pytest.importorskip("pandas")
+    from src.db import dao
+    from src.domain.nearest import _load_gazetteer_csv
+    from src.domain.pipeline import _compare_class_db_cached, compare_dates_db
+
+    gaz = tmp_path / "gaz.csv"
+    gaz.write_text("name,lon,lat\nTownA,0.5,0.5\n")
+    for clazz in ("occupied", "gray"):
+        dao.upsert_layer(clazz=clazz, d=date(2024, 1, 1), geojson_text=json.dumps(_fc(_square(0, 0, 1.0))))
+        dao.upsert_layer(clazz=clazz, d=date(2024, 1, 2), geojson_text=json.dumps(_fc(_square(0.5, 0, 1.0))))
+    _compare_class_db_cached.cache_clear()
+    _load_gazetteer_csv.cache_clear()
+
+    kwargs = dict(clazzes=("occupied", "gray"), gazetteer_csv=str(gaz), min_area_km2=0.0)
+    items = compare_dates_db("2024_01_01", "2024_01_02", **kwargs)
+    assert {it.settlement for it in items} == {"TownA"}
+    assert _load_gazetteer_csv.cache_info().misses == 1  # parsed once for both classes
+
+    compare_dates_db("2024_01_01", "2024_01_02", **kwargs)
+    assert _compare_class_db_cached.cache_info().hits == 2
+
+    # the memo holds the file version, not the frame: dropping the loader caches frees it
+    import gc
+    import weakref
+
+    from src.domain.nearest import _gaz_in_metric, load_gazetteer_csv
+
+    ref = weakref.ref(load_gazetteer_csv(str(gaz)))
+    _load_gazetteer_csv.cache_clear()
+    _gaz_in_metric.cache_clear()
+    gc.collect()
+    assert ref() is None
+    assert _compare_class_db_cached.cache_info().currsize == 2
@@ -1,5 +1,5 @@
 import json
-from src.domain.geo_changes import compute_changes
+from src.domain.geo_changes import compute_changes, dissolve_to_wkb
 
 # Simple square test: prev is 1x1 at origin, curr is 1x1 shifted by +0.5 lon (overlaps half)
 
@@ -25,7 +25,22 @@ def test_compute_changes_basic():
     curr = json.dumps(featurecollection(square(0.5, 0, 1.0)))
     items = compute_changes(prev, curr, min_area_km2=0.0)
     # We expect both gained and lost patches (two patches total)
-    assert any(it["status"] == "gained" for it in items)
-    assert any(it["status"] == "lost" for it in items)
+    assert any(it.status == "gained" for it in items)
+    assert any(it.status == "lost" for it in items)
     # Areas should be positive
-    assert all(it["area_km2"] > 0 for it in items)
+    assert all(it.area_km2 > 0 for it in items)
+    # bbox encloses the patch centroid
+    for it in items:
+        minx, miny, maxx, maxy = it.bbox
+        lon, lat = it.centroid
+        assert minx <= lon <= maxx and miny <= lat <= maxy
+
+
+def test_compute_changes_accepts_dissolved_wkb():
+    prev = json.dumps(featurecollection(square(0, 0, 1.0)))
+    curr = json.dumps(featurecollection(square(0.5, 0, 1.0)))
+    from_json = compute_changes(prev, curr, min_area_km2=0.0)
+    from_wkb = compute_changes(dissolve_to_wkb(prev), dissolve_to_wkb(curr), min_area_km2=0.0)
+    assert [(it.status, it.area_km2) for it in from_wkb] == [
+        (it.status, it.area_km2) for it in from_json
+    ]
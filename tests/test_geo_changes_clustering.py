@@ -25,9 +25,21 @@ def test_clustering_merges_close_patches():
 
     # without clustering: likely 2 gained patches
     items_no = compute_changes(prev, curr, min_area_km2=0.0, cluster_distance_km=None)
-    assert len([i for i in items_no if i["status"] == "gained"]) >= 2
+    assert len([i for i in items_no if i.status == "gained"]) >= 2
 
     # with clustering distance should merge them into 1 (distance depends on projection)
     items_cl = compute_changes(prev, curr, min_area_km2=0.0, cluster_distance_km=5.0)
-    gained = [i for i in items_cl if i["status"] == "gained"]
+    gained = [i for i in items_cl if i.status == "gained"]
     assert len(gained) == 1
+
+
+def test_clustering_without_pyproj_uses_great_circle_distance(monkeypatch):
+    import src.domain.geo_changes as geo_changes
+
+    monkeypatch.setattr(geo_changes, "_PYPROJ_AVAILABLE", False)
+    prev = json.dumps(fc([]))
+    # two squares ~1 km apart and a third ~70 km east
+    curr = json.dumps(fc([feat(square(30.0, 50.0)), feat(square(30.015, 50.0)), feat(square(31.0, 50.0))]))
+
+    items = compute_changes(prev, curr, min_area_km2=0.0, cluster_distance_km=5.0)
+    assert len([i for i in items if i.status == "gained"]) == 2
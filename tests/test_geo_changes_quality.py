@@ -1,5 +1,7 @@
 import json
 
+import pytest
+
 from src.domain.geo_changes import compute_changes
 
 
@@ -35,3 +37,27 @@ def test_compute_changes_empty_featurecollection():
     curr = json.dumps({"type": "FeatureCollection", "features": []})
     items = compute_changes(prev, curr, min_area_km2=0.0)
     assert items == []
+
+
+def test_load_geom_chunked_dissolve_matches_single_pass(monkeypatch):
+    import shapely
+
+    import src.domain.geo_changes as geo_changes
+
+    squares = [
+        {"type": "Polygon", "coordinates": [[[x, 0], [x + 1, 0], [x + 1, 1], [x, 1], [x, 0]]]}
+        for x in (0.0, 5.0, 0.5, 5.5, 0.8, 9.0)  # each overlapping pair straddles a chunk boundary
+    ]
+    twisted = {"type": "Polygon", "coordinates": [[[20, 0], [21, 1], [21, 0], [20, 1], [20, 0]]]}
+    features = [{"type": "Feature", "geometry": g, "properties": {}} for g in [*squares, twisted]]
+    text = json.dumps({"type": "FeatureCollection", "features": features})
+
+    whole = geo_changes._load_geom(text)
+    monkeypatch.setattr(geo_changes, "_LOAD_CHUNK_SIZE", 2)
+    chunked = geo_changes._load_geom(text)
+
+    assert shapely.equals(chunked, whole)
+    assert chunked.area == pytest.approx(whole.area)
+    # overlaps from different chunks are dissolved (0..1.8, 5..6.5, 9..10) and the bowtie
+    # is repaired into two triangles of 0.25 each
+    assert chunked.area == pytest.approx(1.8 + 1.5 + 1.0 + 0.5)
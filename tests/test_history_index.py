@@ -1,10 +1,9 @@
-import json
 from pathlib import Path
 
-from src.data_io.history_index import parse_history_entries, save_index, load_index
-
 
 def test_parse_history_entries_variants():
+    from src.data_io.history_index import parse_history_entries
+
     raw_list = [{"id": 123, "timestamp": 1000}, {"id": 124, "timestamp": 2000}]
     entries = parse_history_entries(raw_list)
     assert [e.id for e in entries] == [123, 124]
@@ -15,6 +14,8 @@ def test_parse_history_entries_variants():
 
 
 def test_save_and_load_index(tmp_path: Path):
+    from src.data_io.history_index import load_index, parse_history_entries, save_index
+
     entries = parse_history_entries([{"id": 7, "timestamp": 1700000000}])
     out = save_index(entries, data_root=str(tmp_path))
     assert out.exists()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+pytestmark = pytest.mark.xdist_group(name="db")
+
+
+def test_insert_changes_dedupes_across_probe_batches(db_engine, monkeypatch):
+    from src.db import dao
+    from src.domain.geo_changes import ChangeItem
+
+    monkeypatch.setattr(dao, "_IN_BATCH_SIZE", 2)
+    items = [ChangeItem("gained", 0.1 * (i + 1), (30.0 + i, 50.0)) for i in range(5)]
+    kwargs = dict(clazz="occupied", date_prev=date(2024, 1, 1), date_curr=date(2024, 1, 2))
+
+    assert dao.insert_changes(items=items[:3], **kwargs) == 3
+    # the already stored hashes fall into different probe batches of the second call
+    assert dao.insert_changes(items=items[::-1] + items[:1], **kwargs) == 2
+    assert dao.insert_changes(items=items, **kwargs) == 0
@@ -0,0 +1,57 @@
+import pytest
+
+from src.domain.nearest import nearest_from_gazetteer, nearest_from_gazetteer_bulk
+
+
+def test_nearest_from_gazetteer_list_fallback():
+    gaz = [("TownA", 30.0, 50.0), ("TownB", 31.0, 50.0)]
+    name, dist_km = nearest_from_gazetteer(30.9, 50.0, gaz)
+    assert name == "TownB"
+    assert 5.0 < dist_km < 10.0
+
+
+def test_nearest_from_gazetteer_geodataframe():
+    gpd = pytest.importorskip("geopandas")
+    gaz = gpd.GeoDataFrame(
+        {"name": ["TownA", "TownB"]},
+        geometry=gpd.points_from_xy([30.0, 31.0], [50.0, 50.0]),
+        crs="EPSG:4326",
+    )
+    name, dist_km = nearest_from_gazetteer(30.1, 50.0, gaz)
+    assert name == "TownA"
+    assert 5.0 < dist_km < 10.0
+    # repeated lookups reuse the cached projection and return consistent results
+    assert nearest_from_gazetteer(30.9, 50.0, gaz)[0] == "TownB"
+
+
+def test_nearest_from_gazetteer_bulk_matches_scalar():
+    gpd = pytest.importorskip("geopandas")
+    gaz = gpd.GeoDataFrame(
+        {"name": ["TownA", "TownB"]},
+        geometry=gpd.points_from_xy([30.0, 31.0], [50.0, 50.0]),
+        crs="EPSG:4326",
+    )
+    lons, lats = [30.1, 30.9, 30.4], [50.0, 50.0, 50.1]
+    names, dists = nearest_from_gazetteer_bulk(lons, lats, gaz)
+    for lon, lat, name, dist in zip(lons, lats, names, dists, strict=True):
+        exp_name, exp_dist = nearest_from_gazetteer(lon, lat, gaz)
+        assert name == exp_name
+        assert dist == pytest.approx(exp_dist)
+
+
+def test_load_gazetteer_csv_is_cached_per_file_version(tmp_path):
+    pytest.importorskip("pandas")
+    import os
+
+    from src.domain.nearest import load_gazetteer_csv
+
+    path = tmp_path / "gaz.csv"
+    path.write_text("name,lon,lat\nTownA,30.0,50.0\n")
+    first = load_gazetteer_csv(str(path))
+    assert load_gazetteer_csv(str(path)) is first
+
+    path.write_text("name,lon,lat\nTownA,30.0,50.0\nTownB,31.0,50.0\n")
+    os.utime(path, ns=(0, 1))  # a distinct mtime even on coarse-grained filesystems
+    second = load_gazetteer_csv(str(path))
+    assert second is not first
+    assert len(second) == 2
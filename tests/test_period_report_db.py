@@ -1,50 +1,86 @@
 from __future__ import annotations
 
-import json
 from datetime import date
 
-from src.db import dao
-from src.db.base import Base, clear_engine_cache, get_engine
-from src.domain.period import generate_period_report_db
+import pytest
+from layer_payloads import fc_square
 
+pytestmark = pytest.mark.xdist_group(name="db")
 
-def _square(lon: float, lat: float, size: float = 1.0) -> dict:
-    return {
-        "type": "Polygon",
-        "coordinates": [
-            [
-                [lon, lat],
-                [lon + size, lat],
-                [lon + size, lat + size],
-                [lon, lat + size],
-                [lon, lat],
-            ]
-        ],
-    }
 
+# Layer payloads, serialized once per test process: a unit square shifting east by 0.5° a day.
+_OCCUPIED_D1 = fc_square(0.0, 0.0, 1.0)
+_OCCUPIED_D2 = fc_square(0.5, 0.0, 1.0)
+_OCCUPIED_D3 = fc_square(1.0, 0.0, 1.0)
+_GRAY_D1 = fc_square(5.0, 0.0, 1.0)
+_GRAY_D2 = fc_square(5.5, 0.0, 1.0)
 
-def _fc(geom: dict) -> dict:
-    return {"type": "FeatureCollection", "features": [{"type": "Feature", "geometry": geom, "properties": {}}]}
 
+def test_period_report_db_recomputes_only_missing_classes(db_engine, monkeypatch):
+    import src.domain.period as period
+    from src.db import dao
+    from src.domain.period import generate_period_report_db
 
-def test_period_report_db_sqlite(tmp_path, monkeypatch):
-    db_path = tmp_path / "t.db"
-    monkeypatch.setenv("DATABASE_URL", f"sqlite+pysqlite:///{db_path}")
-    clear_engine_cache()
+    d1, d2 = date(2024, 1, 1), date(2024, 1, 2)
+    dao.upsert_layers_bulk(
+        [
+            {"clazz": "occupied", "d": d1, "geojson_text": _OCCUPIED_D1},
+            {"clazz": "occupied", "d": d2, "geojson_text": _OCCUPIED_D2},
+            {"clazz": "gray", "d": d1, "geojson_text": _GRAY_D1},
+            {"clazz": "gray", "d": d2, "geojson_text": _GRAY_D2},
+        ]
+    )
 
-    engine = get_engine()
-    Base.metadata.create_all(engine)
+    # Cache only "occupied" for the pair.
+    full = generate_period_report_db("2024_01_01", "2024_01_02", clazzes=("occupied",), min_area_km2=0.0)
 
-    # Three consecutive days, with shifting polygon each day
-    d1 = date(2024, 1, 1)
-    d2 = date(2024, 1, 2)
-    d3 = date(2024, 1, 3)
+    calls: list[tuple[str, ...]] = []
+    real = period.compare_dates_db
 
-    dao.upsert_layer(clazz="occupied", d=d1, geojson_text=json.dumps(_fc(_square(0.0, 0.0, 1.0))))
-    dao.upsert_layer(clazz="occupied", d=d2, geojson_text=json.dumps(_fc(_square(0.5, 0.0, 1.0))))
-    dao.upsert_layer(clazz="occupied", d=d3, geojson_text=json.dumps(_fc(_square(1.0, 0.0, 1.0))))
+    def spy(*args, **kwargs):
+        calls.append(kwargs["clazzes"])
+        return real(*args, **kwargs)
 
-    rep = generate_period_report_db("2024_01_01", "2024_01_03", clazzes=("occupied",), min_area_km2=0.0, top_n=5)
+    monkeypatch.setattr(period, "compare_dates_db", spy)
+    rep = generate_period_report_db(
+        "2024_01_01", "2024_01_02", clazzes=("occupied", "gray"), min_area_km2=0.0
+    )
+    assert calls == [("gray",)]
+    assert rep.summary_by_dir["occupied"] == full.summary_by_dir["occupied"]
+    assert rep.summary_by_dir["gray"]["gained"] > 0
+    assert {it.direction for it in rep.top_items} == {"occupied", "gray"}
+
+
+def _seed_occupied_days() -> None:
+    from src.db import dao
+
+    dao.upsert_layers_bulk(
+        [
+            {"clazz": "occupied", "d": date(2024, 1, 1), "geojson_text": _OCCUPIED_D1},
+            {"clazz": "occupied", "d": date(2024, 1, 2), "geojson_text": _OCCUPIED_D2},
+            {"clazz": "occupied", "d": date(2024, 1, 3), "geojson_text": _OCCUPIED_D3},
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def period_report(_memory_engine, clear_db):
+    """Period report over three days of an "occupied" layer, computed once per module.
+
+    The rows are deleted again before the report is handed out, so the shared DB is empty
+    whichever tests run before, after or between its users.
+    """
+    from src.domain.period import generate_period_report_db
+
+    _seed_occupied_days()
+    try:
+        return generate_period_report_db("2024_01_01", "2024_01_03", clazzes=("occupied",), min_area_km2=0.0, top_n=5)
+    finally:
+        clear_db(_memory_engine)
+
+
+def test_period_report_db_computes_summary(period_report):
+    rep = period_report
 
     assert rep.day_reports  # should have at least one day pair
     assert len(rep.day_reports) == 2  # 01->02 and 02->03
@@ -52,15 +88,19 @@ def test_period_report_db_sqlite(tmp_path, monkeypatch):
     assert rep.summary_by_dir["occupied"]["gained"] > 0
     assert rep.summary_by_dir["occupied"]["lost"] > 0
 
-    # Second run should use cached summaries even if layers are removed.
-    # Remove all layers (keep dates + summaries).
-    from sqlalchemy import delete
+
+def test_period_report_db_cache_survives_layer_delete(db_engine, period_report):
     from src.db.models import Layer
+    from src.domain.period import generate_period_report_db
+
+    _seed_occupied_days()
+    generate_period_report_db("2024_01_01", "2024_01_03", clazzes=("occupied",), min_area_km2=0.0, top_n=5)
 
-    # Directly delete layers using SQLAlchemy Core.
-    with engine.begin() as conn:
-        conn.execute(delete(Layer))
+    # Second run should use cached summaries even if layers are removed.
+    # Directly delete layers with raw SQL (no statement compilation), keeping dates + summaries.
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql(f"DELETE FROM {Layer.__tablename__}")
 
     rep2 = generate_period_report_db("2024_01_01", "2024_01_03", clazzes=("occupied",), min_area_km2=0.0, top_n=5)
     assert rep2.day_reports
-    assert rep2.summary_by_dir["occupied"]["gained"] > 0
+    assert rep2.summary_by_dir == period_report.summary_by_dir
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import itertools
+from datetime import date, timedelta
+
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import HealthCheck, given, settings  # noqa: E402
+from hypothesis import strategies as st  # noqa: E402
+from layer_payloads import fc_square  # noqa: E402
+
+pytestmark = pytest.mark.xdist_group(name="db")
+
+_DAY0 = date(2024, 1, 1)
+# Each example gets its own date range, so examples sharing one `db_engine` never see each
+# other's layers or cached summaries.
+_RUNS = itertools.count()
+
+
+@settings(max_examples=20, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(st.lists(st.tuples(st.floats(0, 10), st.floats(0, 10)), min_size=2, max_size=5))
+def test_period_report_db_square_walk(db_engine, offsets):
+    from src.db import dao
+    from src.domain.period import generate_period_report_db
+
+    day0 = _DAY0 + timedelta(days=10 * next(_RUNS))
+    days = [day0 + timedelta(days=i) for i in range(len(offsets))]
+    dao.upsert_layers_bulk(
+        {"clazz": "occupied", "d": d, "geojson_text": fc_square(lon, lat)}
+        for d, (lon, lat) in zip(days, offsets, strict=True)
+    )
+
+    rep = generate_period_report_db(
+        f"{days[0]:%Y_%m_%d}", f"{days[-1]:%Y_%m_%d}", clazzes=("occupied",), min_area_km2=0.0, top_n=3
+    )
+
+    assert len(rep.day_reports) == len(days) - 1
+    totals = rep.summary_by_dir["occupied"]
+    assert totals["gained"] >= 0 and totals["lost"] >= 0
+    if len(set(offsets)) == 1:
+        assert totals == {"gained": 0.0, "lost": 0.0}
+    areas = [it.area_km2 for it in rep.top_items]
+    assert len(areas) <= 3
+    assert areas == sorted(areas, reverse=True)
+    assert all(it.direction == "occupied" for it in rep.top_items)
@@ -1,9 +1,47 @@
-import json
 from pathlib import Path
 
-from src.domain.pipeline import compare_latest
-
 
 def test_compare_latest_no_files(tmp_path: Path):
+    from src.domain.pipeline import compare_latest
+
     items = compare_latest(str(tmp_path))
     assert items == []
+
+
+def test_scan_layer_files_walks_nested_dirs(tmp_path: Path):
+    from src.domain.pipeline import _scan_layer_files
+
+    names = [
+        "2024/01/layer_occupied_2024_01_02.geojson",
+        "2024/01/layer_gray_2024_01_02.geojson",
+        "layer_occupied_2024_01_01.geojson",
+        "2023/12/31/layer_occupied_2023_12_31.geojson",
+        "2024/01/layer_frontline_2024_01_02.geojson",  # class not requested
+        "2024/01/layer_occupied_latest.geojson",  # no date
+        "2024/01/old_layer_occupied_2024_01_03.geojson",  # prefixed
+        "2024/01/layer_occupied_2024_01_03.geojson.gz",  # suffixed
+        "2024/01/notes.txt",
+    ]
+    for name in names:
+        p = tmp_path / name
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("{}")
+    linked = tmp_path / "elsewhere"
+    linked.mkdir()
+    (linked / "layer_gray_2024_02_01.geojson").write_text("{}")
+    (tmp_path / "link").symlink_to(linked, target_is_directory=True)
+
+    found = _scan_layer_files(str(tmp_path), clazzes=("occupied", "gray"))
+    rel = {c: [p.relative_to(tmp_path).as_posix() for p in files] for c, files in found.items()}
+    # sorted by path; symlinked directories are not descended into, as with Path.rglob
+    assert rel == {
+        "occupied": [
+            "2023/12/31/layer_occupied_2023_12_31.geojson",
+            "2024/01/layer_occupied_2024_01_02.geojson",
+            "layer_occupied_2024_01_01.geojson",
+        ],
+        "gray": [
+            "2024/01/layer_gray_2024_01_02.geojson",
+            "elsewhere/layer_gray_2024_02_01.geojson",
+        ],
+    }
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from src.domain._proj_kernels import cea_fwd, utm_epsg_params, utm_fwd
+
+
+def test_utm_epsg_params():
+    assert utm_epsg_params(32636) == (36, True)
+    assert utm_epsg_params(32736) == (36, False)
+    assert utm_epsg_params(6933) is None
+
+
+@pytest.mark.parametrize("epsg", [32636, 32637, 32736])
+def test_utm_fwd_matches_proj(epsg):
+    pyproj = pytest.importorskip("pyproj")
+    zone, north = utm_epsg_params(epsg)
+    lon = np.linspace(zone * 6 - 186, zone * 6 - 180, 25)
+    lat = np.linspace(1.0, 70.0, 25) * (1 if north else -1)
+    x, y = utm_fwd(lon, lat, zone, north)
+    px, py = pyproj.Transformer.from_crs(4326, epsg, always_xy=True).transform(lon, lat)
+    assert np.allclose(x, px, atol=1e-3)
+    assert np.allclose(y, py, atol=1e-3)
+
+
+def test_cea_fwd_matches_proj():
+    pyproj = pytest.importorskip("pyproj")
+    lon = np.linspace(-179.0, 179.0, 25)
+    lat = np.linspace(-80.0, 80.0, 25)
+    x, y = cea_fwd(lon, lat)
+    px, py = pyproj.Transformer.from_crs(4326, 6933, always_xy=True).transform(lon, lat)
+    assert np.allclose(x, px, atol=1e-3)
+    assert np.allclose(y, py, atol=1e-3)
@@ -1,4 +1,2 @@
-from src.reporting.report_generator import build_telegram_report
-
-def test_build_report_empty():
-    assert "без существенных изменений" in build_telegram_report([])
+def test_build_report_empty(render_report):
+    assert "без существенных изменений" in render_report([])
@@ -1,18 +1,32 @@
 from src.reporting.report_generator import build_telegram_report
 
+EMPTY_MARKER = "без существенных"
+TOP3 = "ТОП-3"
 
-def test_report_empty():
-    assert "без существенных" in build_telegram_report([])
 
+def test_report_empty(render_report):
+    assert EMPTY_MARKER in render_report([])
 
-def test_report_top3():
-    items = [
-        {"direction": "occupied", "settlement": "TownA", "status": "gained", "area_km2": 1.2, "centroid": (0, 0)},
-        {"direction": "gray", "settlement": "TownB", "status": "lost", "area_km2": 0.7, "centroid": (0, 0)},
-        {"direction": "occupied", "settlement": "TownC", "status": "gained", "area_km2": 2.1, "centroid": (0, 0)},
-        {"direction": "gray", "settlement": "TownD", "status": "lost", "area_km2": 0.2, "centroid": (0, 0)},
-    ]
-    text = build_telegram_report(items)
-    assert "ТОП-3" in text
+
+def test_report_top3(render_report, report_items_top3):
+    text = render_report(report_items_top3)
+    assert TOP3 in text
     assert "TownC" in text  # largest
     assert "TownA" in text  # second largest
+
+
+def test_report_accepts_single_pass_iterator(report_items_top3):
+    assert build_telegram_report(it for it in report_items_top3) == build_telegram_report(report_items_top3)
+    assert EMPTY_MARKER in build_telegram_report(iter(()))
+
+
+def test_report_top3_ties_follow_input_order_of_largest_patch():
+    from src.domain.geo_changes import ChangeItem
+
+    def item(settlement: str, area: float) -> ChangeItem:
+        return ChangeItem(direction="occupied", settlement=settlement, status="gained", area_km2=area, centroid=(0, 0))
+
+    # TownA's group is seen first, but its 2.0 km² patch comes after TownB's and TownC's
+    items = [item("TownA", 0.1), item("TownB", 2.0), item("TownC", 2.0), item("TownA", 2.0), item("TownD", 2.0)]
+    top = build_telegram_report(items).split(TOP3, 1)[1]
+    assert [line.split()[2] for line in top.splitlines() if line.startswith("- ")] == ["TownB", "TownC", "TownA"]
@@ -0,0 +1,35 @@
+from src.domain.geo_changes import ChangeItem
+from src.reporting.period_report import aggregate_period
+
+
+def _item(direction: str, status: str, area: float, settlement: str = "") -> ChangeItem:
+    return ChangeItem(status, area, (0.0, 0.0), direction=direction, settlement=settlement)
+
+
+def test_aggregate_period_ties_keep_earliest_item():
+    days = [
+        [_item("occupied", "gained", 1.0, "A"), _item("occupied", "lost", 2.0, "B")],
+        [_item("gray", "gained", 1.0, "C"), _item("gray", "lost", 1.0, "D")],
+    ]
+    _, top = aggregate_period(days, top_n=3)
+    assert [it.settlement for it in top] == ["B", "A", "C"]
+
+
+def test_aggregate_period_top_n_zero_returns_no_items():
+    summary, top = aggregate_period([[_item("occupied", "gained", 1.0)]], top_n=0)
+    assert top == []
+    assert summary == {"occupied": {"gained": 1.0, "lost": 0.0}}
+
+
+def test_aggregate_period_summary_fills_missing_status():
+    days = [
+        [_item("occupied", "gained", 1.5), _item("gray", "lost", 0.5)],
+        [_item("occupied", "gained", 0.5), _item("", "other", 9.0)],
+    ]
+    summary, top = aggregate_period(days)
+    # every direction gets both keys; unknown statuses count towards neither
+    assert summary == {
+        "occupied": {"gained": 2.0, "lost": 0.0},
+        "gray": {"gained": 0.0, "lost": 0.5},
+    }
+    assert len(top) == 4